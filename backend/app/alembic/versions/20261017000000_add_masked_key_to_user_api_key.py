@@ -0,0 +1,36 @@
+"""add_masked_key_to_user_api_key
+
+Revision ID: 20261017000000
+Revises: 20250104000000
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017000000'
+down_revision = '20250104000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Check if column exists before adding it (idempotent migration)
+    # This handles the case where migration was already applied via Supabase MCP
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'user_api_key' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('user_api_key')]
+    if 'masked_key' not in columns:
+        op.add_column('user_api_key', sa.Column('masked_key', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True))
+
+    # Existing rows are backfilled from Infisical by scripts/backfill_api_key_masks.py
+
+
+def downgrade():
+    op.drop_column('user_api_key', 'masked_key')
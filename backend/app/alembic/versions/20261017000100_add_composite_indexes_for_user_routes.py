@@ -0,0 +1,103 @@
+"""add_composite_indexes_for_user_routes
+
+Revision ID: 20261017000100
+Revises: 20261017000000
+Create Date: 2026-10-17 00:01:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017000100'
+down_revision = '20261017000000'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, unique)
+COMPOSITE_INDEXES = [
+    ('ix_teammember_team_user', 'teammember', ['team_id', 'user_id'], True),
+    ('ix_userapikey_user_svc_cred', 'user_api_key', ['user_id', 'service_name', 'credential_type'], True),
+    ('ix_usersession_user_expires', 'user_session', ['user_id', 'expires_at'], False),
+]
+
+
+def _drop_invalid_index(conn, name, table):
+    # A failed CONCURRENTLY build leaves an INVALID index behind under the same
+    # name, which the inspector reports as existing; drop it so it is rebuilt
+    invalid = conn.execute(
+        sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {'name': name},
+    ).first()
+    if invalid:
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        return True
+    return False
+
+
+def _check_no_duplicates(conn, name, table, columns):
+    # The routes used to check-then-insert, so concurrent requests may have
+    # left duplicate rows that would abort the unique build. Deleting them
+    # could drop a member's role or a stored credential reference, so stop
+    # and let an operator resolve them instead
+    cols = ', '.join(columns)
+    not_null = ' AND '.join(f'{col} IS NOT NULL' for col in columns)
+    duplicates = conn.execute(
+        sa.text(
+            f"SELECT {cols}, count(*) AS copies FROM {table} WHERE {not_null} "
+            f"GROUP BY {cols} HAVING count(*) > 1 LIMIT 5"
+        )
+    ).all()
+    if duplicates:
+        examples = '; '.join(
+            ', '.join(f'{col}={value}' for col, value in zip(columns, row[:-1], strict=True))
+            + f' ({row[-1]} rows)'
+            for row in duplicates
+        )
+        raise RuntimeError(
+            f"Cannot create unique index {name}: {table} has duplicate "
+            f"({cols}) rows, e.g. {examples}. Remove the duplicates and rerun "
+            f"the migration."
+        )
+
+
+def upgrade():
+    # Check if indexes exist before creating them (idempotent migration)
+    # This handles the case where migration was already applied via Supabase MCP
+    # user_preferences.user_id is already covered by its unique index
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    missing = []
+    for name, table, columns, unique in COMPOSITE_INDEXES:
+        if table not in tables:
+            continue
+        indexes = [idx['name'] for idx in inspector.get_indexes(table)]
+        if name not in indexes:
+            missing.append((name, table, columns, unique))
+
+    # CONCURRENTLY cannot run inside a transaction, and avoids locking the
+    # membership, API key and session tables against writes while the
+    # indexes build
+    with op.get_context().autocommit_block():
+        for index in COMPOSITE_INDEXES:
+            if _drop_invalid_index(conn, index[0], index[1]) and index not in missing:
+                missing.append(index)
+        for name, table, columns, unique in missing:
+            if unique:
+                _check_no_duplicates(conn, name, table, columns)
+            op.create_index(
+                name, table, columns, unique=unique, postgresql_concurrently=True
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _unique in reversed(COMPOSITE_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,50 @@
+"""add_login_history_user_created_index
+
+Revision ID: 20261017000300
+Revises: 20261017000200
+Create Date: 2026-10-17 00:03:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017000300'
+down_revision = '20261017000200'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_login_history_user_created'
+
+
+def upgrade():
+    # Check if index exists before creating it (idempotent migration)
+    # This handles the case where migration was already applied via Supabase MCP
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'login_history' not in inspector.get_table_names():
+        return
+    indexes = [idx['name'] for idx in inspector.get_indexes('login_history')]
+    if INDEX_NAME in indexes:
+        return
+
+    # CONCURRENTLY cannot run inside a transaction, and avoids locking
+    # login_history against writes while the index builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            'login_history',
+            ['user_id', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME,
+            table_name='login_history',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,49 @@
+"""drop_redundant_user_api_key_user_index
+
+Revision ID: 20261017000400
+Revises: 20261017000300
+Create Date: 2026-10-17 00:04:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017000400'
+down_revision = '20261017000300'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_user_api_key_user_id'
+COVERING_INDEX_NAME = 'ix_userapikey_user_svc_cred'
+
+
+def upgrade():
+    # Only drop the single-column index once the composite unique index that
+    # covers user_id lookups is in place (idempotent migration)
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'user_api_key' not in inspector.get_table_names():
+        return
+    indexes = [idx['name'] for idx in inspector.get_indexes('user_api_key')]
+    if INDEX_NAME not in indexes or COVERING_INDEX_NAME not in indexes:
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME,
+            table_name='user_api_key',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            'user_api_key',
+            ['user_id'],
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,64 @@
+"""add_workflow_listing_indexes
+
+Revision ID: 20261017000500
+Revises: 20261017000400
+Create Date: 2026-10-17 00:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017000500'
+down_revision = '20261017000400'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, extra create_index kwargs)
+LISTING_INDEXES = [
+    ('ix_workflow_owner_id', 'workflow', ['owner_id'], {}),
+    (
+        'ix_workflowexecution_workflow_started',
+        'workflowexecution',
+        ['workflow_id', sa.text('started_at DESC')],
+        {},
+    ),
+    (
+        'ix_workflowexecution_failed_started',
+        'workflowexecution',
+        [sa.text('started_at DESC')],
+        {'postgresql_where': sa.text("status = 'failed'")},
+    ),
+]
+
+
+def upgrade():
+    # Check if indexes exist before creating them (idempotent migration)
+    # This handles the case where migration was already applied via Supabase MCP
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    tables = inspector.get_table_names()
+
+    missing = []
+    for name, table, columns, kwargs in LISTING_INDEXES:
+        if table not in tables:
+            continue
+        indexes = [idx['name'] for idx in inspector.get_indexes(table)]
+        if name not in indexes:
+            missing.append((name, table, columns, kwargs))
+
+    # CONCURRENTLY cannot run inside a transaction, and avoids locking the
+    # workflow tables against writes while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in missing:
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, **kwargs
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _kwargs in reversed(LISTING_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -3,9 +3,12 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import lambda_stmt
 from sqlalchemy.exc import DatabaseError, OperationalError
+from sqlalchemy.orm import joinedload
 from sqlmodel import Session, select
 
+from app import crud
 from app.core.db import engine
 from app.models import User
 from app.services.clerk_service import verify_clerk_token
@@ -94,19 +97,34 @@ def get_current_user(session: SessionDep, credentials: TokenDep) -> User:
             f"Verified Clerk token for user: {user_email} (ID: {clerk_user_id})"
         )
 
-        # Find user in our database by clerk_user_id first, then email
+        # Find user in our database by clerk_user_id first, then email.
+        # Preferences are joined in so routes can use current_user.preferences
+        # without another round-trip. lambda_stmt caches the built statement,
+        # since this runs on every authenticated request.
         try:
             user = None
             if clerk_user_id:
                 # Try to find by clerk_user_id first (more reliable)
-                user = session.exec(
-                    select(User).where(User.clerk_user_id == clerk_user_id)
+                user = session.scalars(
+                    lambda_stmt(
+                        lambda: (
+                            select(User)
+                            .options(joinedload(User.preferences))
+                            .where(User.clerk_user_id == clerk_user_id)
+                        )
+                    )
                 ).first()
 
             # Fallback to email if not found by clerk_user_id
             if not user:
-                statement = select(User).where(User.email == user_email)
-                user = session.exec(statement).first()
+                statement = lambda_stmt(
+                    lambda: (
+                        select(User)
+                        .options(joinedload(User.preferences))
+                        .where(User.email == user_email)
+                    )
+                )
+                user = session.scalars(statement).first()
         except (OperationalError, DatabaseError) as db_error:
             logger.error(
                 f"Database connection error while fetching user: {str(db_error)}",
@@ -163,6 +181,7 @@ def get_current_user(session: SessionDep, credentials: TokenDep) -> User:
                 session.add(new_user)
                 session.commit()
                 session.refresh(new_user)
+                crud.invalidate_user_email_cache(user_email)
                 user = new_user
                 logger.info(
                     f"Created new user in database: {user_email} "
@@ -190,7 +209,7 @@ def get_current_user(session: SessionDep, credentials: TokenDep) -> User:
             except Exception as create_error:
                 logger.warning(f"Error creating user, retrying: {str(create_error)}")
                 session.rollback()
-                user = session.exec(statement).first()
+                user = session.scalars(statement).first()
                 if not user:
                     logger.error(
                         f"Failed to create user after retry: {str(create_error)}",
@@ -0,0 +1,26 @@
+"""
+API Responses
+
+Default JSON response class for the API.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """
+    orjson-backed JSON response.
+
+    Content returned through a response model has already been through
+    jsonable_encoder by the time it is rendered; routes returning this class
+    directly hand it raw rows. Naive datetimes are rendered without an offset,
+    exactly as datetime.isoformat() and jsonable_encoder write them, so both
+    paths produce the same timestamps. OPT_NON_STR_KEYS keeps parity with the
+    stdlib encoder this replaces, which accepted non-string dict keys.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
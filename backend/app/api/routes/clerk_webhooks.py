@@ -12,6 +12,7 @@ from typing import Any
 from fastapi import APIRouter, HTTPException, Request, status
 from sqlmodel import Session, select
 
+from app import crud
 from app.api.deps import get_db
 from app.core.config import settings
 from app.models import User, UserPreferences
@@ -154,6 +155,7 @@ async def clerk_webhook(request: Request) -> dict[str, Any]:
                     db.add(new_user)
                     db.commit()
                     db.refresh(new_user)
+                    crud.invalidate_user_email_cache(new_user.email)
                     logger.info(
                         f"Created user from Clerk webhook: {primary_email} "
                         f"(Clerk ID: {clerk_user_id})"
@@ -279,6 +281,7 @@ async def clerk_webhook(request: Request) -> dict[str, Any]:
 
                 db.add(user)
                 db.commit()
+                crud.invalidate_user_email_cache(user.email)
                 logger.info(
                     f"Updated user from Clerk webhook: {user.email} "
                     f"(Clerk ID: {clerk_user_id}, Fields: {', '.join(updated_fields)})"
@@ -323,6 +326,7 @@ async def clerk_webhook(request: Request) -> dict[str, Any]:
                 user.is_active = False
                 db.add(user)
                 db.commit()
+                crud.invalidate_user_email_cache(user.email)
                 logger.info(
                     f"Deactivated user from Clerk webhook: {user.email} "
                     f"(Clerk ID: {clerk_user_id})"
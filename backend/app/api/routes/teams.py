@@ -8,19 +8,64 @@ import logging
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, Body, HTTPException, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    HTTPException,
+    Request,
+    status,
+)
 from pydantic import EmailStr
-from sqlmodel import select
+from sqlmodel import and_, select
 
 from app.api.deps import CurrentUser, SessionDep
-from app.models import TeamInvitation, TeamMember, User
-from app.services.team_service import TeamService
+from app.models import (
+    TeamInvitation,
+    TeamInvitationAccepted,
+    TeamInvitationCreated,
+    TeamMember,
+)
+from app.services.team_service import TeamService, send_invitation_email_task
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
 
+def require_team_admin(
+    team_id: uuid.UUID,
+    request: Request,
+    session: SessionDep,
+    current_user: CurrentUser,
+) -> TeamMember:
+    """
+    Require the current user to be an owner or admin of the team.
+
+    Memberships are cached on request.state per team so repeated checks within
+    one request only query once.
+    """
+    team_members: dict[uuid.UUID, TeamMember | None] = getattr(
+        request.state, "team_members", {}
+    )
+    if team_id not in team_members:
+        team_members[team_id] = session.exec(
+            select(TeamMember).where(
+                TeamMember.team_id == team_id, TeamMember.user_id == current_user.id
+            )
+        ).first()
+        request.state.team_members = team_members
+
+    member = team_members[team_id]
+    if not member or member.role not in ["owner", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only team owners and admins can manage this team",
+        )
+    return member
+
+
 # ============================================================================
 # Team CRUD Operations
 # ============================================================================
@@ -199,7 +244,11 @@ def list_team_members(
     return {"members": members, "count": len(members)}
 
 
-@router.post("/{team_id}/members", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{team_id}/members",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_team_admin)],
+)
 def add_team_member(
     *,
     session: SessionDep,
@@ -211,19 +260,6 @@ def add_team_member(
     """Add a user to a team (admin/owner only)"""
     team_service = TeamService(session)
 
-    # Check permissions
-    member = session.exec(
-        select(TeamMember).where(
-            TeamMember.team_id == team_id, TeamMember.user_id == current_user.id
-        )
-    ).first()
-
-    if not member or member.role not in ["owner", "admin"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only team owners and admins can add members",
-        )
-
     team_member = team_service.add_member(
         team_id=team_id,
         user_id=user_id,
@@ -234,7 +270,11 @@ def add_team_member(
     return team_member
 
 
-@router.delete("/{team_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{team_id}/members/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(require_team_admin)],
+)
 def remove_team_member(
     *,
     session: SessionDep,
@@ -245,19 +285,6 @@ def remove_team_member(
     """Remove a user from a team (admin/owner only)"""
     team_service = TeamService(session)
 
-    # Check permissions
-    member = session.exec(
-        select(TeamMember).where(
-            TeamMember.team_id == team_id, TeamMember.user_id == current_user.id
-        )
-    ).first()
-
-    if not member or member.role not in ["owner", "admin"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only team owners and admins can remove members",
-        )
-
     # Don't allow removing yourself if you're the owner
     if user_id == current_user.id:
         team = team_service.get_team(team_id)
@@ -274,11 +301,13 @@ def remove_team_member(
         )
 
 
-@router.patch("/{team_id}/members/{user_id}/role")
+@router.patch(
+    "/{team_id}/members/{user_id}/role",
+    dependencies=[Depends(require_team_admin)],
+)
 def update_member_role(
     *,
     session: SessionDep,
-    current_user: CurrentUser,
     team_id: uuid.UUID,
     user_id: uuid.UUID,
     role: str = Body(...),
@@ -286,19 +315,6 @@ def update_member_role(
     """Update a team member's role (owner/admin only)"""
     team_service = TeamService(session)
 
-    # Check permissions
-    member = session.exec(
-        select(TeamMember).where(
-            TeamMember.team_id == team_id, TeamMember.user_id == current_user.id
-        )
-    ).first()
-
-    if not member or member.role not in ["owner", "admin"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only team owners and admins can update member roles",
-        )
-
     team_member = team_service.update_member_role(
         team_id=team_id, user_id=user_id, role=role
     )
@@ -316,38 +332,25 @@ def update_member_role(
 # ============================================================================
 
 
-@router.post("/{team_id}/invitations", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{team_id}/invitations",
+    status_code=status.HTTP_201_CREATED,
+    response_model=TeamInvitationCreated,
+    dependencies=[Depends(require_team_admin)],
+)
 def create_invitation(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    background_tasks: BackgroundTasks,
     team_id: uuid.UUID,
     email: EmailStr = Body(...),
     role: str = Body("member"),
     expires_in_hours: int = Body(168),  # 7 days default
 ) -> Any:
-    """Create and send a team invitation"""
+    """Create a team invitation and queue the invitation email"""
     team_service = TeamService(session)
 
-    # Check permissions
-    member = session.exec(
-        select(TeamMember).where(
-            TeamMember.team_id == team_id, TeamMember.user_id == current_user.id
-        )
-    ).first()
-
-    if not member or member.role not in ["owner", "admin"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only team owners and admins can send invitations",
-        )
-
-    team = team_service.get_team(team_id)
-    if not team:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
-        )
-
     # Create invitation
     invitation = team_service.create_invitation(
         team_id=team_id,
@@ -358,57 +361,41 @@ def create_invitation(
     )
 
     # Send invitation email
-    inviter = session.get(User, current_user.id)
-    inviter_name = (
-        inviter.full_name
-        if inviter and inviter.full_name
-        else inviter.email
-        if inviter
-        else "Team Owner"
+    inviter_name = current_user.full_name or current_user.email or "Team Owner"
+    background_tasks.add_task(
+        send_invitation_email_task,
+        invitation.id,
+        team_id,
+        inviter_name,
     )
-    email_sent = team_service.send_invitation_email(
-        invitation=invitation,
-        team=team,
-        inviter_name=inviter_name,
-    )
-
-    if not email_sent:
-        logger.warning(f"Failed to send invitation email to {email}")
 
-    return {"invitation": invitation, "email_sent": email_sent}
+    return {"invitation": invitation, "email_sent": "queued"}
 
 
-@router.get("/{team_id}/invitations")
+@router.get(
+    "/{team_id}/invitations",
+    dependencies=[Depends(require_team_admin)],
+)
 def list_team_invitations(
     *,
     session: SessionDep,
-    current_user: CurrentUser,
     team_id: uuid.UUID,
     include_accepted: bool = False,
 ) -> Any:
     """List team invitations (admin/owner only)"""
     team_service = TeamService(session)
 
-    # Check permissions
-    member = session.exec(
-        select(TeamMember).where(
-            TeamMember.team_id == team_id, TeamMember.user_id == current_user.id
-        )
-    ).first()
-
-    if not member or member.role not in ["owner", "admin"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only team owners and admins can view invitations",
-        )
-
     invitations = team_service.list_team_invitations(
         team_id=team_id, include_accepted=include_accepted
     )
     return {"invitations": invitations, "count": len(invitations)}
 
 
-@router.post("/invitations/accept", status_code=status.HTTP_200_OK)
+@router.post(
+    "/invitations/accept",
+    status_code=status.HTTP_200_OK,
+    response_model=TeamInvitationAccepted,
+)
 def accept_invitation(
     *,
     session: SessionDep,
@@ -435,21 +422,27 @@ def revoke_invitation(
     """Revoke a team invitation (admin/owner only)"""
     team_service = TeamService(session)
 
-    invitation = session.get(TeamInvitation, invitation_id)
-    if not invitation:
+    # Load the invitation and the caller's role on its team in one query
+    row = session.exec(
+        select(TeamInvitation, TeamMember.role)
+        .outerjoin(
+            TeamMember,
+            and_(
+                TeamMember.team_id == TeamInvitation.team_id,
+                TeamMember.user_id == current_user.id,
+            ),
+        )
+        .where(TeamInvitation.id == invitation_id)
+    ).first()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Invitation not found"
         )
 
     # Check permissions
-    member = session.exec(
-        select(TeamMember).where(
-            TeamMember.team_id == invitation.team_id,
-            TeamMember.user_id == current_user.id,
-        )
-    ).first()
-
-    if not member or member.role not in ["owner", "admin"]:
+    _, role = row
+    if role not in ["owner", "admin"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only team owners and admins can revoke invitations",
@@ -1,14 +1,24 @@
-import json
+import hashlib
+import io
 import logging
-import os
-import tempfile
 import uuid
-import zipfile
 from datetime import datetime, timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlmodel import func, select
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import exists, insert, lambda_stmt, true, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, delete, func, select, update
 
 from app import crud
 from app.api.deps import (
@@ -16,12 +26,17 @@ from app.api.deps import (
     SessionDep,
     get_current_active_superuser,
 )
+from app.api.responses import ORJSONResponse
+from app.cache import default_cache_service
 from app.core.config import settings
-from app.core.security import generate_token, get_password_hash, verify_password
+from app.core.security import (
+    generate_token,
+    get_password_hash_pooled,
+    verify_password_pooled,
+)
 from app.models import (
     LoginHistory,
     Message,
-    TeamMember,
     UpdatePassword,
     User,
     UserAPIKey,
@@ -38,59 +53,105 @@ from app.models import (
     UserUpdate,
     UserUpdateMe,
     Workflow,
-    WorkflowExecution,
+    WorkflowCreate,
 )
 from app.services.api_keys import (
+    SERVICE_CREDENTIAL_TYPES,
     SERVICE_DEFINITIONS,
     default_api_key_service,
 )
 from app.services.storage import default_storage_service
-from app.utils import generate_new_account_email, send_email
+from app.services.user_data_export import (
+    create_export_job,
+    get_export_job,
+    run_user_data_export_job,
+)
+from app.utils import generate_new_account_email, send_email_with_retry
+from app.workflows.list_cache import invalidate_workflow_list_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
+# Total user count shown by the admin listing; may lag by up to the TTL
+USERS_COUNT_CACHE_KEY = "users:count"
+USERS_COUNT_CACHE_TTL_SECONDS = 30
+
+
 @router.get(
     "/",
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(
+    session: SessionDep,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: uuid.UUID | None = None,
+) -> Any:
     """
     Retrieve users.
+
+    Pass the previous page's next_cursor as after_id to page by primary key.
+    skip is kept for existing clients, but deep offsets scan every skipped row.
     """
 
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
+    # The total is cached briefly so paging doesn't re-run count(*) each time
+    count = default_cache_service.get_or_set(
+        USERS_COUNT_CACHE_KEY,
+        lambda: session.exec(select(func.count()).select_from(User)).one(),
+        ttl_seconds=USERS_COUNT_CACHE_TTL_SECONDS,
+    )
 
-    statement = select(User).offset(skip).limit(limit)
+    statement = select(User).order_by(User.id).limit(limit)
+    if after_id:
+        statement = statement.where(User.id > after_id)
+    elif skip:
+        statement = statement.offset(skip)
     users = session.exec(statement).all()
 
-    return UsersPublic(data=users, count=count)
+    next_cursor = users[-1].id if len(users) == limit else None
+    return UsersPublic(data=users, count=count, next_cursor=next_cursor)
 
 
 @router.post(
     "/", dependencies=[Depends(get_current_active_superuser)], response_model=UserPublic
 )
-def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
+def create_user(
+    *, session: SessionDep, user_in: UserCreate, background_tasks: BackgroundTasks
+) -> Any:
     """
     Create new user.
+
+    Hashing runs on the bounded password executor. The new-account email is
+    sent after the response is returned.
     """
-    user = crud.get_user_by_email(session=session, email=user_in.email)
-    if user:
+    if crud.user_email_exists(session=session, email=user_in.email):
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
 
-    user = crud.create_user(session=session, user_create=user_in)
+    hashed_password = get_password_hash_pooled(user_in.password)
+    try:
+        user = crud.create_user(
+            session=session, user_create=user_in, hashed_password=hashed_password
+        )
+    except IntegrityError:
+        # Lost a race with a concurrent signup for the same email
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="The user with this email already exists in the system.",
+        )
+    default_cache_service.delete(USERS_COUNT_CACHE_KEY)
     if settings.emails_enabled and user_in.email:
         email_data = generate_new_account_email(
             email_to=user_in.email, username=user_in.email, password=user_in.password
         )
-        send_email(
+        background_tasks.add_task(
+            send_email_with_retry,
             email_to=user_in.email,
             subject=email_data.subject,
             html_content=email_data.html_content,
@@ -104,18 +165,29 @@ def update_user_me(
 ) -> Any:
     """
     Update own user.
+
+    Fields that already match are dropped, so a no-op PATCH skips the write.
     """
+    user_data = {
+        key: value
+        for key, value in user_in.model_dump(exclude_unset=True).items()
+        if getattr(current_user, key) != value
+    }
+    if not user_data:
+        return current_user
 
-    if user_in.email:
-        existing_user = crud.get_user_by_email(session=session, email=user_in.email)
-        if existing_user and existing_user.id != current_user.id:
-            raise HTTPException(
-                status_code=409, detail="User with this email already exists"
-            )
-    user_data = user_in.model_dump(exclude_unset=True)
+    if user_data.get("email") and crud.user_email_exists(
+        session=session, email=user_data["email"], exclude_user_id=current_user.id
+    ):
+        raise HTTPException(
+            status_code=409, detail="User with this email already exists"
+        )
+    previous_email = current_user.email
     current_user.sqlmodel_update(user_data)
     session.add(current_user)
     session.commit()
+    if "email" in user_data:
+        crud.invalidate_user_email_cache(previous_email, user_data["email"])
     session.refresh(current_user)
     return current_user
 
@@ -126,14 +198,16 @@ def update_password_me(
 ) -> Any:
     """
     Update own password.
+
+    Hashing runs on the bounded password executor.
     """
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not verify_password_pooled(body.current_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect password")
     if body.current_password == body.new_password:
         raise HTTPException(
             status_code=400, detail="New password cannot be the same as the current one"
         )
-    hashed_password = get_password_hash(body.new_password)
+    hashed_password = get_password_hash_pooled(body.new_password)
     current_user.hashed_password = hashed_password
     session.add(current_user)
     session.commit()
@@ -157,44 +231,67 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
+    email = current_user.email
     session.delete(current_user)
     session.commit()
+    default_cache_service.delete(USERS_COUNT_CACHE_KEY)
+    crud.invalidate_user_email_cache(email)
     return Message(message="User deleted successfully")
 
 
+def _track_signup(
+    user_id: str, email: str, full_name: str | None, is_superuser: bool
+) -> None:
+    """Send the signup event and identify the user in PostHog."""
+    from app.observability.posthog import default_posthog_client
+
+    properties = {
+        "email": email,
+        "full_name": full_name,
+        "is_superuser": is_superuser,
+    }
+    default_posthog_client.capture(
+        distinct_id=user_id, event="user_signed_up", properties=properties
+    )
+    default_posthog_client.identify(distinct_id=user_id, properties=properties)
+
+
 @router.post("/signup", response_model=UserPublic)
-def register_user(session: SessionDep, user_in: UserRegister) -> Any:
+def register_user(
+    session: SessionDep, user_in: UserRegister, background_tasks: BackgroundTasks
+) -> Any:
     """
     Create new user without the need to be logged in.
-    """
-    from app.observability.posthog import default_posthog_client
 
-    user = crud.get_user_by_email(session=session, email=user_in.email)
-    if user:
+    Hashing runs on the bounded password executor.
+    """
+    if crud.user_email_exists(session=session, email=user_in.email):
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system",
         )
     user_create = UserCreate.model_validate(user_in)
-    user = crud.create_user(session=session, user_create=user_create)
-
-    # Track user signup in PostHog
-    default_posthog_client.capture(
-        distinct_id=str(user.id),
-        event="user_signed_up",
-        properties={
-            "email": user.email,
-            "full_name": user.full_name,
-            "is_superuser": user.is_superuser,
-        },
-    )
-    default_posthog_client.identify(
-        distinct_id=str(user.id),
-        properties={
-            "email": user.email,
-            "full_name": user.full_name,
-            "is_superuser": user.is_superuser,
-        },
+    hashed_password = get_password_hash_pooled(user_create.password)
+    try:
+        user = crud.create_user(
+            session=session, user_create=user_create, hashed_password=hashed_password
+        )
+    except IntegrityError:
+        # Lost a race with a concurrent signup for the same email
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="The user with this email already exists in the system",
+        )
+    default_cache_service.delete(USERS_COUNT_CACHE_KEY)
+
+    # Track user signup in PostHog after the response is sent
+    background_tasks.add_task(
+        _track_signup,
+        str(user.id),
+        user.email,
+        user.full_name,
+        user.is_superuser,
     )
 
     return user
@@ -239,12 +336,12 @@ def update_user(
             status_code=404,
             detail="The user with this id does not exist in the system",
         )
-    if user_in.email:
-        existing_user = crud.get_user_by_email(session=session, email=user_in.email)
-        if existing_user and existing_user.id != user_id:
-            raise HTTPException(
-                status_code=409, detail="User with this email already exists"
-            )
+    if user_in.email and crud.user_email_exists(
+        session=session, email=user_in.email, exclude_user_id=user_id
+    ):
+        raise HTTPException(
+            status_code=409, detail="User with this email already exists"
+        )
 
     db_user = crud.update_user(session=session, db_user=db_user, user_in=user_in)
     return db_user
@@ -264,8 +361,11 @@ def delete_user(
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
+    email = user.email
     session.delete(user)
     session.commit()
+    default_cache_service.delete(USERS_COUNT_CACHE_KEY)
+    crud.invalidate_user_email_cache(email)
     return Message(message="User deleted successfully")
 
 
@@ -274,7 +374,108 @@ def delete_user(
 # ============================================================================
 
 
-@router.get("/me/api-keys", response_model=list[UserAPIKeyPublic])
+def _mask_credentials(api_key_service: Any, credentials: dict[str, str] | None) -> str:
+    """
+    Build a display mask from retrieved credentials.
+    """
+    main_key = credentials.get("api_key", "") if credentials else ""
+    return api_key_service.mask_key(main_key) if main_key else "***hidden***"
+
+
+def _retrieve_masked_key(api_key_service: Any, user_id: uuid.UUID, api_key: Any) -> str:
+    """
+    Resolve a display mask from Infisical for rows without a stored masked_key.
+    """
+    try:
+        credentials = api_key_service.retrieve_api_key(
+            str(user_id), api_key.service_name, api_key.credential_type
+        )
+        return _mask_credentials(api_key_service, credentials)
+    except Exception as e:
+        # If retrieval fails (e.g., Infisical not configured), use default masked value
+        logger.warning(f"Failed to retrieve API key for masking: {e}")
+    return "***hidden***"
+
+
+def _api_key_public_response(
+    api_key: UserAPIKey, masked_key: str, status_code: int = 200
+) -> ORJSONResponse:
+    """
+    Serialize a persisted row as UserAPIKeyPublic without re-running validation.
+    """
+    return ORJSONResponse(
+        {
+            "id": api_key.id,
+            "service_name": api_key.service_name,
+            "service_display_name": api_key.service_display_name,
+            "credential_type": api_key.credential_type,
+            "masked_key": masked_key,
+            "is_active": api_key.is_active,
+            "last_used_at": api_key.last_used_at,
+            "created_at": api_key.created_at,
+            "updated_at": api_key.updated_at,
+        },
+        status_code=status_code,
+    )
+
+
+def _get_owned_api_key(
+    session: Session, key_id: uuid.UUID, user_id: uuid.UUID
+) -> UserAPIKey:
+    """
+    Load an API key owned by the user, or raise 404.
+
+    Ownership is part of the query, so other users' keys are indistinguishable
+    from missing ones.
+    """
+    api_key = session.exec(
+        select(UserAPIKey).where(UserAPIKey.id == key_id, UserAPIKey.user_id == user_id)
+    ).first()
+    if not api_key:
+        raise HTTPException(status_code=404, detail="API key not found")
+    return api_key
+
+
+# Each key test costs an Infisical lookup and a call to the provider, so tests
+# are capped per user and key before either is touched
+API_KEY_TEST_RATE_LIMIT = 5
+API_KEY_TEST_RATE_WINDOW_SECONDS = 60
+
+
+def limit_api_key_tests(key_id: uuid.UUID, current_user: CurrentUser) -> None:
+    """
+    Reject API key tests beyond the per-user, per-key rate limit with a 429.
+    """
+    attempts = default_cache_service.incr(
+        f"api_key_test:{current_user.id}:{key_id}",
+        ttl_seconds=API_KEY_TEST_RATE_WINDOW_SECONDS,
+    )
+    if attempts > API_KEY_TEST_RATE_LIMIT:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many API key tests, please try again later",
+            headers={"Retry-After": str(API_KEY_TEST_RATE_WINDOW_SECONDS)},
+        )
+
+
+_API_KEY_PUBLIC_COLUMNS = (
+    UserAPIKey.id,
+    UserAPIKey.service_name,
+    UserAPIKey.service_display_name,
+    UserAPIKey.credential_type,
+    UserAPIKey.masked_key,
+    UserAPIKey.is_active,
+    UserAPIKey.last_used_at,
+    UserAPIKey.created_at,
+    UserAPIKey.updated_at,
+)
+
+
+@router.get(
+    "/me/api-keys",
+    response_model=None,
+    responses={200: {"model": list[UserAPIKeyPublic]}},
+)
 def list_user_api_keys(
     current_user: CurrentUser,
     session: SessionDep,
@@ -287,54 +488,49 @@ def list_user_api_keys(
 
     api_key_service = default_api_key_service
 
-    # Get all API keys for user
-    statement = select(UserAPIKey).where(UserAPIKey.user_id == current_user.id)
-    api_keys = session.exec(statement).all()
+    # Select only the public columns; rows are serialized straight to JSON
+    # without building a model per key, and with no ORM instances there are
+    # no relationships to lazy-load per row
+    statement = select(*_API_KEY_PUBLIC_COLUMNS).where(
+        UserAPIKey.user_id == current_user.id
+    )
+    result = [row._asdict() for row in session.exec(statement)]
 
-    # Convert to public format with masked keys
-    result = []
-    for api_key in api_keys:
-        # Retrieve key from Infisical to mask it
+    # Rows created before masked_key existed: resolve them from Infisical in
+    # one concurrent batch and persist the masks with a single bulk UPDATE
+    unmasked = [api_key for api_key in result if api_key["masked_key"] is None]
+    if unmasked:
         try:
-            credentials = api_key_service.retrieve_api_key(
-                str(current_user.id), api_key.service_name, api_key.credential_type
+            credentials = api_key_service.retrieve_api_keys_bulk(
+                str(current_user.id),
+                [(k["service_name"], k["credential_type"]) for k in unmasked],
             )
-
-            masked_key = "***hidden***"
-            if credentials:
-                main_key = credentials.get("api_key", "")
-                if main_key:
-                    masked_key = api_key_service.mask_key(main_key)
         except Exception as e:
             # If retrieval fails (e.g., Infisical not configured), use default masked value
-            logger.warning(f"Failed to retrieve API key for masking: {e}")
-            masked_key = "***hidden***"
-
-        result.append(
-            UserAPIKeyPublic(
-                id=api_key.id,
-                service_name=api_key.service_name,
-                service_display_name=api_key.service_display_name,
-                credential_type=api_key.credential_type,
-                masked_key=masked_key,
-                is_active=api_key.is_active,
-                last_used_at=api_key.last_used_at,
-                created_at=api_key.created_at,
-                updated_at=api_key.updated_at,
+            logger.warning(f"Failed to retrieve API keys for masking: {e}")
+            credentials = {}
+
+        backfill = []
+        for api_key in unmasked:
+            masked_key = _mask_credentials(
+                api_key_service,
+                credentials.get((api_key["service_name"], api_key["credential_type"])),
             )
-        )
+            api_key["masked_key"] = masked_key
+            if masked_key != "***hidden***":
+                backfill.append({"id": api_key["id"], "masked_key": masked_key})
 
-    return result
+        if backfill:
+            session.execute(update(UserAPIKey), backfill)
+            session.commit()
 
+    return ORJSONResponse(result)
 
-@router.get("/me/api-keys/services", response_model=dict[str, Any])
-def list_available_services() -> Any:
-    """
-    List all available services that support API keys.
 
-    Returns service definitions with display names and credential types.
-    """
-    return {
+# SERVICE_DEFINITIONS is static, so the response body and its ETag are built
+# once at import time
+_SERVICES_JSON = orjson.dumps(
+    {
         "services": {
             service_name: {
                 "display_name": service_def["display_name"],
@@ -343,9 +539,43 @@ def list_available_services() -> Any:
             for service_name, service_def in SERVICE_DEFINITIONS.items()
         }
     }
+)
+_SERVICES_ETAG = f'"{hashlib.sha256(_SERVICES_JSON).hexdigest()[:16]}"'
+_SERVICES_CACHE_HEADERS = {
+    "ETag": _SERVICES_ETAG,
+    "Cache-Control": "public, max-age=3600",
+}
+
 
+@router.get(
+    "/me/api-keys/services",
+    response_model=None,
+    responses={200: {"model": dict[str, Any]}, 304: {"description": "Not Modified"}},
+)
+def list_available_services(
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    """
+    List all available services that support API keys.
+
+    Returns service definitions with display names and credential types.
+    """
+    if if_none_match == _SERVICES_ETAG:
+        return Response(status_code=304, headers=_SERVICES_CACHE_HEADERS)
 
-@router.post("/me/api-keys", response_model=UserAPIKeyPublic, status_code=201)
+    return Response(
+        content=_SERVICES_JSON,
+        media_type="application/json",
+        headers=_SERVICES_CACHE_HEADERS,
+    )
+
+
+@router.post(
+    "/me/api-keys",
+    response_model=None,
+    status_code=201,
+    responses={201: {"model": UserAPIKeyPublic}},
+)
 def create_user_api_key(
     current_user: CurrentUser,
     session: SessionDep,
@@ -370,7 +600,10 @@ def create_user_api_key(
 
     # Validate credential type
     if api_key_data.credential_type:
-        if api_key_data.credential_type not in service_def["credential_types"]:
+        if (
+            api_key_data.credential_type
+            not in SERVICE_CREDENTIAL_TYPES[api_key_data.service_name]
+        ):
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid credential type '{api_key_data.credential_type}' for service '{api_key_data.service_name}'. Valid types: {service_def['credential_types']}",
@@ -379,21 +612,6 @@ def create_user_api_key(
         # Default to first credential type
         api_key_data.credential_type = service_def["credential_types"][0]
 
-    # Check if API key already exists for this service/credential type
-    existing = session.exec(
-        select(UserAPIKey).where(
-            UserAPIKey.user_id == current_user.id,
-            UserAPIKey.service_name == api_key_data.service_name,
-            UserAPIKey.credential_type == api_key_data.credential_type,
-        )
-    ).first()
-
-    if existing:
-        raise HTTPException(
-            status_code=400,
-            detail=f"API key already exists for {service_def['display_name']} ({api_key_data.credential_type}). Update or delete existing key first.",
-        )
-
     # Validate API key
     if not api_key_service.validate_api_key(
         api_key_data.service_name, api_key_data.api_key, api_key_data.credential_type
@@ -412,17 +630,9 @@ def create_user_api_key(
     if api_key_data.access_token_secret:
         additional_credentials["access_token_secret"] = api_key_data.access_token_secret
 
-    # Store encrypted key in Infisical
-    infisical_path = api_key_service.store_api_key(
-        str(current_user.id),
-        api_key_data.service_name,
-        api_key_data.api_key,
-        api_key_data.credential_type,
-        additional_credentials if additional_credentials else None,
-    )
-
-    # Generate hash for verification
+    # Generate hash for verification and mask for display
     key_hash = api_key_service.hash_key(api_key_data.api_key)
+    masked_key = api_key_service.mask_key(api_key_data.api_key)
 
     # Create database record
     api_key = UserAPIKey(
@@ -430,32 +640,53 @@ def create_user_api_key(
         service_name=api_key_data.service_name,
         service_display_name=service_def["display_name"],
         credential_type=api_key_data.credential_type,
-        infisical_path=infisical_path,
+        infisical_path=api_key_service.get_infisical_path(
+            str(current_user.id),
+            api_key_data.service_name,
+            api_key_data.credential_type,
+        ),
         key_hash=key_hash,
+        masked_key=masked_key,
         is_active=True,
     )
 
+    # The unique index on (user_id, service_name, credential_type) rejects
+    # duplicates; commit before touching Infisical so an existing key's secret
+    # is never overwritten, and no transaction stays open across the call
     session.add(api_key)
-    session.commit()
-    session.refresh(api_key)
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"API key already exists for {service_def['display_name']} ({api_key_data.credential_type}). Update or delete existing key first.",
+        )
 
-    # Return masked key
-    masked_key = api_key_service.mask_key(api_key_data.api_key)
+    # Store encrypted key in Infisical, dropping the record again if that fails
+    try:
+        api_key_service.store_api_key(
+            str(current_user.id),
+            api_key_data.service_name,
+            api_key_data.api_key,
+            api_key_data.credential_type,
+            additional_credentials if additional_credentials else None,
+        )
+    except Exception:
+        session.delete(api_key)
+        session.commit()
+        raise
 
-    return UserAPIKeyPublic(
-        id=api_key.id,
-        service_name=api_key.service_name,
-        service_display_name=api_key.service_display_name,
-        credential_type=api_key.credential_type,
-        masked_key=masked_key,
-        is_active=api_key.is_active,
-        last_used_at=api_key.last_used_at,
-        created_at=api_key.created_at,
-        updated_at=api_key.updated_at,
-    )
+    session.refresh(api_key)
+
+    return _api_key_public_response(api_key, masked_key, status_code=201)
 
 
-@router.put("/me/api-keys/{key_id}", response_model=UserAPIKeyPublic)
+@router.put(
+    "/me/api-keys/{key_id}",
+    response_model=None,
+    responses={200: {"model": UserAPIKeyPublic}},
+)
 def update_user_api_key(
     key_id: uuid.UUID,
     current_user: CurrentUser,
@@ -467,17 +698,11 @@ def update_user_api_key(
 
     Can update the key value or toggle active status.
     """
-    from datetime import datetime
-
     api_key_service = default_api_key_service
 
     # Get API key
-    api_key = session.get(UserAPIKey, key_id)
-    if not api_key:
-        raise HTTPException(status_code=404, detail="API key not found")
-
-    if api_key.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    api_key = _get_owned_api_key(session, key_id, current_user.id)
+    changes: dict[str, Any] = {}
 
     # Update key value if provided
     if api_key_data.api_key:
@@ -510,39 +735,37 @@ def update_user_api_key(
             additional_credentials if additional_credentials else None,
         )
 
-        # Update hash
-        api_key.key_hash = api_key_service.hash_key(api_key_data.api_key)
-        api_key.updated_at = datetime.utcnow()
+        # Update hash and stored mask
+        changes["key_hash"] = api_key_service.hash_key(api_key_data.api_key)
+        changes["masked_key"] = api_key_service.mask_key(api_key_data.api_key)
+        changes["updated_at"] = func.now()
 
     # Update active status
     if api_key_data.is_active is not None:
-        api_key.is_active = api_key_data.is_active
-
-    session.add(api_key)
+        changes["is_active"] = api_key_data.is_active
+
+    # Rows created before masked_key existed get their mask stored with this
+    # write, so later reads never need Infisical for it
+    masked_key = changes.get("masked_key", api_key.masked_key)
+    if masked_key is None:
+        masked_key = _retrieve_masked_key(api_key_service, current_user.id, api_key)
+        if masked_key != "***hidden***":
+            changes["masked_key"] = masked_key
+
+    if not changes:
+        return _api_key_public_response(api_key, masked_key)
+
+    # One UPDATE ... RETURNING instead of add, commit and refresh
+    api_key = session.scalars(
+        update(UserAPIKey)
+        .where(UserAPIKey.id == api_key.id)
+        .values(**changes)
+        .returning(UserAPIKey)
+    ).one()
+    # Serialize before committing, which would expire the row and reload it
+    response = _api_key_public_response(api_key, masked_key)
     session.commit()
-    session.refresh(api_key)
-
-    # Return masked key
-    credentials = api_key_service.retrieve_api_key(
-        str(current_user.id), api_key.service_name, api_key.credential_type
-    )
-    masked_key = "***hidden***"
-    if credentials:
-        main_key = credentials.get("api_key", "")
-        if main_key:
-            masked_key = api_key_service.mask_key(main_key)
-
-    return UserAPIKeyPublic(
-        id=api_key.id,
-        service_name=api_key.service_name,
-        service_display_name=api_key.service_display_name,
-        credential_type=api_key.credential_type,
-        masked_key=masked_key,
-        is_active=api_key.is_active,
-        last_used_at=api_key.last_used_at,
-        created_at=api_key.created_at,
-        updated_at=api_key.updated_at,
-    )
+    return response
 
 
 @router.delete("/me/api-keys/{key_id}", response_model=Message)
@@ -559,12 +782,7 @@ def delete_user_api_key(
     api_key_service = default_api_key_service
 
     # Get API key
-    api_key = session.get(UserAPIKey, key_id)
-    if not api_key:
-        raise HTTPException(status_code=404, detail="API key not found")
-
-    if api_key.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    api_key = _get_owned_api_key(session, key_id, current_user.id)
 
     # Delete from Infisical
     api_key_service.delete_api_key(
@@ -578,7 +796,11 @@ def delete_user_api_key(
     return Message(message="API key deleted successfully")
 
 
-@router.post("/me/api-keys/{key_id}/test", response_model=dict[str, Any])
+@router.post(
+    "/me/api-keys/{key_id}/test",
+    response_model=dict[str, Any],
+    dependencies=[Depends(limit_api_key_tests)],
+)
 def test_user_api_key(
     key_id: uuid.UUID,
     current_user: CurrentUser,
@@ -592,16 +814,14 @@ def test_user_api_key(
     api_key_service = default_api_key_service
 
     # Get API key
-    api_key = session.get(UserAPIKey, key_id)
-    if not api_key:
-        raise HTTPException(status_code=404, detail="API key not found")
+    api_key = _get_owned_api_key(session, key_id, current_user.id)
 
-    if api_key.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    # Retrieve key from Infisical
+    # Retrieve key from Infisical (or the credentials cache), which also
+    # confirms it still exists for services validated without a test call
     credentials = api_key_service.retrieve_api_key(
-        str(current_user.id), api_key.service_name, api_key.credential_type
+        str(current_user.id),
+        api_key.service_name,
+        api_key.credential_type,
     )
 
     if not credentials:
@@ -611,22 +831,25 @@ def test_user_api_key(
     if not api_key_value:
         raise HTTPException(status_code=400, detail="Invalid API key format")
 
-    # Validate key
+    # Validate key; services in KEYLESS_VALIDATION_SERVICES skip the test call
     is_valid = api_key_service.validate_api_key(
         api_key.service_name, api_key_value, api_key.credential_type
     )
 
-    # Update last_used_at if valid
-    if is_valid:
-        from datetime import datetime
+    service_display_name = api_key.service_display_name
 
-        api_key.last_used_at = datetime.utcnow()
-        session.add(api_key)
+    # Update last_used_at if valid, stamped by the database
+    if is_valid:
+        session.exec(
+            update(UserAPIKey)
+            .where(UserAPIKey.id == api_key.id)
+            .values(last_used_at=func.now())
+        )
         session.commit()
 
     return {
         "valid": is_valid,
-        "service": api_key.service_display_name,
+        "service": service_display_name,
         "message": "API key is valid" if is_valid else "API key validation failed",
     }
 
@@ -641,18 +864,9 @@ def get_user_preferences(current_user: CurrentUser, session: SessionDep) -> Any:
     """
     Get user preferences. Creates default preferences if none exist.
     """
-    preferences = session.exec(
-        select(UserPreferences).where(UserPreferences.user_id == current_user.id)
-    ).first()
-
-    if not preferences:
-        # Create default preferences
-        preferences = UserPreferences(user_id=current_user.id)
-        session.add(preferences)
-        session.commit()
-        session.refresh(preferences)
-
-    return preferences
+    return current_user.preferences or crud.get_or_create_user_preferences(
+        session=session, user_id=current_user.id
+    )
 
 
 @router.patch("/me/preferences", response_model=UserPreferences)
@@ -664,16 +878,9 @@ def update_user_preferences(
     """
     Update user preferences.
     """
-    preferences = session.exec(
-        select(UserPreferences).where(UserPreferences.user_id == current_user.id)
-    ).first()
-
-    if not preferences:
-        # Create preferences if they don't exist
-        preferences = UserPreferences(user_id=current_user.id)
-        session.add(preferences)
-        session.commit()
-        session.refresh(preferences)
+    preferences = current_user.preferences or crud.get_or_create_user_preferences(
+        session=session, user_id=current_user.id
+    )
 
     # Update only provided fields
     update_data = preferences_update.model_dump(exclude_unset=True)
@@ -692,23 +899,34 @@ def update_user_preferences(
 
 @router.get("/me/sessions", response_model=list[UserSession])
 def get_user_sessions(
-    current_user: CurrentUser, session: SessionDep, limit: int = 50
+    current_user: CurrentUser,
+    session: SessionDep,
+    limit: int = 50,
+    after_last_active: datetime | None = None,
+    after_id: uuid.UUID | None = None,
 ) -> Any:
     """
     Get active sessions for current user.
-    """
-    from datetime import datetime
 
-    # Get active sessions (not expired)
+    Sessions are ordered newest-first by (last_active_at, id). To fetch the
+    next page, pass the last session's last_active_at and id as
+    after_last_active and after_id.
+    """
+    # Get active sessions (not expired); now() is evaluated by the database
     statement = (
         select(UserSession)
         .where(
             UserSession.user_id == current_user.id,
-            UserSession.expires_at > datetime.utcnow(),
+            UserSession.expires_at > func.now(),
         )
-        .order_by(UserSession.last_active_at.desc())
+        .order_by(UserSession.last_active_at.desc(), UserSession.id.desc())
         .limit(limit)
     )
+    if after_last_active and after_id:
+        statement = statement.where(
+            tuple_(UserSession.last_active_at, UserSession.id)
+            < tuple_(after_last_active, after_id)
+        )
     sessions = session.exec(statement).all()
     return list(sessions)
 
@@ -734,25 +952,23 @@ def revoke_user_session(
 
 @router.delete("/me/sessions", response_model=Message)
 def revoke_all_sessions_except_current(
-    current_user: CurrentUser, session: SessionDep
+    current_user: CurrentUser,
+    session: SessionDep,
+    current_session_token: str | None = Header(default=None, alias="X-Session-Token"),
 ) -> Any:
     """
     Revoke all sessions except the current one.
-    Note: This requires the current session token to be passed in headers.
+    The current session is identified by the X-Session-Token header; if it is
+    omitted, every active session is revoked.
     """
-    from datetime import datetime
-
-    # Get all active sessions except current (this is a simplified version)
-    # In production, you'd need to identify the current session token
-    statement = select(UserSession).where(
+    # Delete all active sessions in a single statement
+    statement = delete(UserSession).where(
         UserSession.user_id == current_user.id,
-        UserSession.expires_at > datetime.utcnow(),
+        UserSession.expires_at > func.now(),
     )
-    sessions = session.exec(statement).all()
-
-    # Delete all sessions (in production, exclude current session)
-    for user_session in sessions:
-        session.delete(user_session)
+    if current_session_token:
+        statement = statement.where(UserSession.session_token != current_session_token)
+    session.execute(statement)
 
     session.commit()
     return Message(message="All sessions revoked successfully")
@@ -770,14 +986,20 @@ def get_login_history(
     """
     Get login history for current user.
     """
-    statement = (
-        select(LoginHistory)
-        .where(LoginHistory.user_id == current_user.id)
-        .order_by(LoginHistory.created_at.desc())
-        .limit(limit)
+    user_id = current_user.id
+    statement = lambda_stmt(
+        lambda: (
+            select(LoginHistory)
+            .where(LoginHistory.user_id == user_id)
+            .order_by(LoginHistory.created_at.desc())
+        )
     )
-    history = session.exec(statement).all()
-    return list(history)
+    statement += lambda s: s.limit(limit)
+    return list(session.scalars(statement).all())
+
+
+# Window in which repeated login callbacks are recorded only once
+LOGIN_DEDUP_SECONDS = 300
 
 
 @router.post("/me/track-login", response_model=Message)
@@ -788,7 +1010,7 @@ def track_login(
     Track a login event. Called by frontend after successful Clerk authentication.
     Creates login history and session records.
     """
-    from datetime import datetime, timedelta
+    from datetime import datetime
 
     # Get client info
     ip_address = request.client.host if request.client else "unknown"
@@ -797,19 +1019,26 @@ def track_login(
         ip_address = forwarded_for.split(",")[0].strip()
     user_agent = request.headers.get("user-agent", "unknown")
 
-    # Check if we've already logged this login recently (within 5 minutes)
-    recent_login = session.exec(
-        select(LoginHistory)
-        .where(
-            LoginHistory.user_id == current_user.id,
-            LoginHistory.success.is_(True),
-            LoginHistory.created_at > datetime.utcnow() - timedelta(minutes=5),
-        )
-        .order_by(LoginHistory.created_at.desc())
-        .limit(1)
-    ).first()
+    # Only log one login per user every 5 minutes; Redis SET NX answers this
+    # without touching the database
+    should_log = default_cache_service.set_if_absent(
+        f"login-dedup:{current_user.id}", "1", ttl_seconds=LOGIN_DEDUP_SECONDS
+    )
+    if should_log is None:
+        # Redis unavailable: fall back to checking login history. The filter
+        # matches ix_login_history_user_recent, so this is a short index probe
+        should_log = not session.exec(
+            select(
+                exists().where(
+                    LoginHistory.user_id == current_user.id,
+                    LoginHistory.success == true(),
+                    LoginHistory.created_at
+                    > func.now() - timedelta(seconds=LOGIN_DEDUP_SECONDS),
+                )
+            )
+        ).one()
 
-    if not recent_login:
+    if should_log:
         # Log successful login
         login_history = LoginHistory(
             user_id=current_user.id,
@@ -817,7 +1046,6 @@ def track_login(
             user_agent=user_agent[:500],
             success=True,
         )
-        session.add(login_history)
 
         # Create session record
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -832,191 +1060,49 @@ def track_login(
             user_agent=user_agent[:500],
             expires_at=expires_at,
         )
-        session.add(user_session)
+        session.add_all([login_history, user_session])
         session.commit()
 
     return Message(message="Login tracked successfully")
 
 
-@router.post("/me/data/export", response_model=dict[str, str])
+@router.post("/me/data/export", response_model=dict[str, Any], status_code=202)
 def export_user_data(
-    current_user: CurrentUser,
-    session: SessionDep,
+    current_user: CurrentUser, background_tasks: BackgroundTasks
 ) -> Any:
     """
-    Export all user data as a ZIP file.
+    Start exporting all user data as a ZIP file.
 
     Includes:
     - User profile and preferences
     - Workflows and workflow executions
     - API keys (masked)
     - Team memberships
-    - Connector connections
-    - Agent tasks
-    - RAG indexes
-    - OCR jobs
-    - Scraping jobs
-    - OSINT streams
-
-    Returns a download URL for the exported ZIP file.
-    """
-    # Create temporary ZIP file
-    temp_dir = tempfile.mkdtemp()
-    zip_path = os.path.join(temp_dir, f"user_data_export_{current_user.id}.zip")
-
-    export_data = {
-        "export_date": datetime.utcnow().isoformat(),
-        "user_id": str(current_user.id),
-        "user_email": current_user.email,
-        "user_profile": {
-            "email": current_user.email,
-            "full_name": current_user.full_name,
-            "is_active": current_user.is_active,
-            "is_superuser": current_user.is_superuser,
-        },
-    }
-
-    # Export workflows
-    workflows = session.exec(
-        select(Workflow).where(Workflow.owner_id == current_user.id)
-    ).all()
-    export_data["workflows"] = [
-        {
-            "id": str(w.id),
-            "name": w.name,
-            "description": w.description,
-            "is_active": w.is_active,
-            "trigger_config": w.trigger_config,
-            "graph_config": w.graph_config,
-            "created_at": w.created_at.isoformat(),
-            "updated_at": w.updated_at.isoformat(),
-        }
-        for w in workflows
-    ]
-
-    # Export workflow executions (limit to last 1000)
-    executions = session.exec(
-        select(WorkflowExecution)
-        .where(WorkflowExecution.owner_id == current_user.id)
-        .order_by(WorkflowExecution.started_at.desc())
-        .limit(1000)
-    ).all()
-    export_data["workflow_executions"] = [
-        {
-            "execution_id": e.execution_id,
-            "workflow_id": str(e.workflow_id),
-            "status": e.status,
-            "started_at": e.started_at.isoformat() if e.started_at else None,
-            "completed_at": e.completed_at.isoformat() if e.completed_at else None,
-        }
-        for e in executions
-    ]
-
-    # Export API keys (masked)
-    api_keys = session.exec(
-        select(UserAPIKey).where(UserAPIKey.user_id == current_user.id)
-    ).all()
-    export_data["api_keys"] = [
-        {
-            "service_name": ak.service_name,
-            "service_display_name": ak.service_display_name,
-            "credential_type": ak.credential_type,
-            "masked_key": "***hidden***",
-            "is_active": ak.is_active,
-            "created_at": ak.created_at.isoformat(),
-        }
-        for ak in api_keys
-    ]
-
-    # Export team memberships
-    team_members = session.exec(
-        select(TeamMember).where(TeamMember.user_id == current_user.id)
-    ).all()
-    export_data["team_memberships"] = [
-        {
-            "team_id": str(tm.team_id),
-            "role": tm.role,
-            "joined_at": tm.joined_at.isoformat() if tm.joined_at else None,
-        }
-        for tm in team_members
-    ]
-
-    # Export user preferences
-    try:
-        from app.models import UserPreferences
-
-        preferences = session.exec(
-            select(UserPreferences).where(UserPreferences.user_id == current_user.id)
-        ).first()
-        if preferences:
-            export_data["preferences"] = {
-                "theme": preferences.theme,
-                "timezone": preferences.timezone,
-                "language": preferences.language,
-            }
-    except Exception:
-        pass
-
-    # Create ZIP file
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-        # Add main data file
-        zipf.writestr(
-            "user_data.json",
-            json.dumps(export_data, indent=2, default=str),
-        )
 
-        # Add README
-        readme = f"""User Data Export
-Generated: {datetime.utcnow().isoformat()}
-User ID: {current_user.id}
-Email: {current_user.email}
+    The export is built in the background. Poll the returned status_url until
+    the status is "completed" to get the download URL. Job status is shared
+    between workers through Redis; without REDIS_URL, run a single worker.
+    """
+    job = create_export_job(current_user.id)
+    background_tasks.add_task(run_user_data_export_job, job["job_id"], current_user.id)
 
-This export contains:
-- User profile information
-- Workflows and workflow executions
-- API keys (masked for security)
-- Team memberships
-- User preferences
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"{settings.API_V1_STR}/users/me/data/export/{job['job_id']}",
+    }
 
-All timestamps are in UTC.
-"""
-        zipf.writestr("README.txt", readme)
 
-    # Upload to storage
-    try:
-        storage_service = default_storage_service
-        file_name = f"exports/user_{current_user.id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
-
-        with open(zip_path, "rb") as f:
-            upload_result = storage_service.upload_file(
-                bucket="exports",
-                file_path=file_name,
-                file_data=f.read(),
-                content_type="application/zip",
-            )
+@router.get("/me/data/export/{job_id}", response_model=dict[str, Any])
+def get_user_data_export(job_id: str, current_user: CurrentUser) -> Any:
+    """
+    Get the status of a data export job, including the download URL once ready.
+    """
+    job = get_export_job(job_id)
+    if not job or job.get("user_id") != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Export job not found")
 
-        # Clean up temp file
-        os.remove(zip_path)
-        os.rmdir(temp_dir)
-
-        return {
-            "download_url": upload_result.get("url")
-            or upload_result.get("signed_url")
-            or upload_result.get("public_url"),
-            "expires_at": (datetime.utcnow() + timedelta(days=7)).isoformat(),
-            "message": "Data export completed successfully",
-        }
-    except Exception as e:
-        # Clean up on error
-        if os.path.exists(zip_path):
-            os.remove(zip_path)
-        if os.path.exists(temp_dir):
-            os.rmdir(temp_dir)
-        logger.error(f"Failed to upload export: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to create export: {str(e)}",
-        )
+    return {key: value for key, value in job.items() if key != "user_id"}
 
 
 @router.post("/me/data/import", response_model=Message)
@@ -1029,11 +1115,9 @@ async def import_user_data(
     Import workflows from a JSON file.
 
     Accepts a JSON file with workflow definitions.
-    Expected format: {"workflows": [{"name": "...", "description": "...", ...}]}
+    Expected format: {"workflows": [{"name": "...", "description": "...", ...}]},
+    or a bare array of workflows such as workflows.json from a data export.
     """
-    from app import crud
-    from app.models import WorkflowCreate
-
     # Check content type
     content_type = request.headers.get("content-type", "")
     if not content_type.startswith("application/json"):
@@ -1044,33 +1128,36 @@ async def import_user_data(
 
     # Parse JSON body
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
     except Exception as e:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid JSON: {str(e)}",
         )
 
-    # Validate structure
-    if "workflows" not in body:
+    # Validate structure; exports write workflows.json as a bare array
+    if isinstance(body, list):
+        workflows_data = body
+    elif isinstance(body, dict) and "workflows" in body:
+        workflows_data = body["workflows"]
+    else:
         raise HTTPException(
             status_code=400,
             detail="JSON must contain a 'workflows' array",
         )
 
-    workflows_data = body["workflows"]
     if not isinstance(workflows_data, list):
         raise HTTPException(
             status_code=400,
             detail="'workflows' must be an array",
         )
 
-    imported_count = 0
     errors = []
+    rows: list[dict[str, Any]] = []
 
     for workflow_data in workflows_data:
         try:
-            # Create workflow
+            # Validate now, insert all valid workflows together below
             workflow_create = WorkflowCreate(
                 name=workflow_data.get("name", "Imported Workflow"),
                 description=workflow_data.get("description"),
@@ -1078,19 +1165,40 @@ async def import_user_data(
                 trigger_config=workflow_data.get("trigger_config", {}),
                 graph_config=workflow_data.get("graph_config", {}),
             )
-
-            crud.workflow.create(
-                session=session,
-                obj_in=workflow_create,
-                owner_id=current_user.id,
+            rows.append(
+                Workflow(
+                    **workflow_create.model_dump(), owner_id=current_user.id
+                ).model_dump()
             )
-            imported_count += 1
         except Exception as e:
             logger.error(f"Failed to import workflow: {e}", exc_info=True)
             errors.append(
                 f"Failed to import workflow '{workflow_data.get('name', 'unknown')}': {str(e)}"
             )
 
+    imported_count = 0
+    if rows:
+        try:
+            # One executemany INSERT for the whole batch
+            with session.begin_nested():
+                session.execute(insert(Workflow), rows)
+            imported_count = len(rows)
+        except Exception as e:
+            logger.warning(f"Bulk workflow import failed, retrying one by one: {e}")
+            # Fall back to per-row inserts so one bad row doesn't sink the rest
+            for row in rows:
+                try:
+                    with session.begin_nested():
+                        session.execute(insert(Workflow), [row])
+                    imported_count += 1
+                except Exception as e:
+                    logger.error(f"Failed to import workflow: {e}", exc_info=True)
+                    errors.append(
+                        f"Failed to import workflow '{row['name']}': {str(e)}"
+                    )
+        session.commit()
+        invalidate_workflow_list_cache(current_user.id)
+
     if errors:
         return Message(
             message=f"Imported {imported_count} workflows with {len(errors)} errors. Check logs for details."
@@ -1099,6 +1207,12 @@ async def import_user_data(
     return Message(message=f"Successfully imported {imported_count} workflows")
 
 
+AVATAR_MAX_BYTES = 2 * 1024 * 1024
+# Allowance for multipart boundaries and headers around the file itself
+AVATAR_FORM_OVERHEAD_BYTES = 64 * 1024
+AVATAR_READ_CHUNK_BYTES = 64 * 1024
+
+
 @router.post("/me/avatar", response_model=dict[str, str])
 async def upload_avatar(
     request: Request, current_user: CurrentUser, session: SessionDep
@@ -1110,6 +1224,14 @@ async def upload_avatar(
     """
     from fastapi import UploadFile
 
+    # Reject obviously oversized uploads before reading the body at all
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > AVATAR_MAX_BYTES + AVATAR_FORM_OVERHEAD_BYTES:
+            raise HTTPException(
+                status_code=413, detail="File size must be less than 2MB"
+            )
+
     # Get file from request
     form = await request.form()
     file = form.get("file")
@@ -1125,10 +1247,15 @@ async def upload_avatar(
     ):
         raise HTTPException(status_code=400, detail="File must be an image")
 
-    # Validate file size (max 2MB)
-    contents = await upload_file.read()
-    if len(contents) > 2 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File size must be less than 2MB")
+    # Read in bounded chunks and stop as soon as the size limit is exceeded
+    buffer = io.BytesIO()
+    while chunk := await upload_file.read(AVATAR_READ_CHUNK_BYTES):
+        if buffer.tell() + len(chunk) > AVATAR_MAX_BYTES:
+            raise HTTPException(
+                status_code=413, detail="File size must be less than 2MB"
+            )
+        buffer.write(chunk)
+    contents = buffer.getvalue()
 
     # Generate filename
     file_extension = (
@@ -1137,31 +1264,24 @@ async def upload_avatar(
     filename = f"{current_user.id}/{uuid.uuid4()}.{file_extension}"
 
     try:
-        # Upload to Supabase Storage
-        upload_result = default_storage_service.upload_file(
+        # Upload to Supabase Storage off the event loop; the storage client
+        # is blocking and would otherwise stall every other request
+        upload_result = await run_in_threadpool(
+            default_storage_service.upload_file,
             bucket="avatars",
             file_path=filename,
             file_data=contents,
             content_type=upload_file.content_type,
         )
 
-        # Update user preferences
-        preferences = session.exec(
-            select(UserPreferences).where(UserPreferences.user_id == current_user.id)
-        ).first()
-
-        if not preferences:
-            preferences = UserPreferences(user_id=current_user.id)
-            session.add(preferences)
-
-        preferences.avatar_url = upload_result.get("url") or upload_result.get(
-            "public_url"
+        # Update user preferences in a single upsert
+        avatar_url = crud.set_user_avatar_url(
+            session=session,
+            user_id=current_user.id,
+            avatar_url=upload_result.get("url") or upload_result.get("public_url"),
         )
-        session.add(preferences)
-        session.commit()
-        session.refresh(preferences)
 
-        return {"avatar_url": preferences.avatar_url or ""}
+        return {"avatar_url": avatar_url or ""}
     except Exception as e:
         logger.error(f"Failed to upload avatar: {e}", exc_info=True)
         raise HTTPException(
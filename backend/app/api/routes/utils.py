@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
@@ -28,9 +28,13 @@ def test_email(email_to: EmailStr) -> Message:
     return Message(message="Test email sent")
 
 
-@router.get("/health-check")
-async def health_check() -> bool:
-    return True
+# Pre-serialized so liveness probes skip response validation and JSON encoding
+HEALTH_CHECK_BODY = b"true"
+
+
+@router.get("/health-check", response_model=bool)
+async def health_check() -> Response:
+    return Response(content=HEALTH_CHECK_BODY, media_type="application/json")
 
 
 @router.get("/circuit-breaker-status")
@@ -4,27 +4,73 @@ Workflow API Routes
 Endpoints for managing workflows and executions.
 """
 
+import hashlib
 import logging
 import uuid
+from collections.abc import Callable, Iterator
 from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, Body, HTTPException, Query, Request, WebSocket
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import BigInteger, cast, func, tuple_
 from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
-from sqlmodel import select
+from sqlmodel import Session, select
 
 from app.api.deps import CurrentUser, SessionDep
-from app.core.db import check_db_connectivity
+from app.api.responses import ORJSONResponse
+from app.core.db import engine, get_circuit_breaker_status
 from app.models import (
+    User,
     Workflow,
     WorkflowCreate,
     WorkflowExecution,
     WorkflowPublic,
     WorkflowUpdate,
 )
+from app.observability.posthog import default_posthog_client
+from app.workflows.analytics import default_analytics
+from app.workflows.analytics_cache import (
+    ANALYTICS_REFRESH_AFTER_SECONDS,
+    analytics_cache_key,
+    cache_analytics,
+    claim_analytics_refresh,
+    get_cached_analytics,
+    invalidate_analytics_cache,
+)
+from app.workflows.debugging import DebuggerError, default_debugger
+from app.workflows.dependencies import DependencyError, default_dependency_manager
 from app.workflows.engine import WorkflowEngine, WorkflowNotFoundError
 from app.workflows.history import ExecutionHistory
+from app.workflows.list_cache import (
+    cache_workflow_list,
+    get_cached_workflow_list,
+    invalidate_workflow_list_cache,
+)
+from app.workflows.monitoring import default_workflow_monitor
+from app.workflows.ownership_cache import (
+    get_execution_owner_id,
+    set_execution_owner_id,
+)
 from app.workflows.scheduler import WorkflowScheduler
+from app.workflows.testing import TestExecutionError, default_test_runner
+from app.workflows.webhook_triggers import (
+    WebhookTriggerError,
+    default_webhook_trigger_manager,
+)
+from app.workflows.websocket import websocket_endpoint
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +82,131 @@ scheduler = WorkflowScheduler(workflow_engine)
 history = ExecutionHistory(workflow_engine)
 
 
+def _authorize_execution(
+    session: Session, execution_id: uuid.UUID, current_user: User
+) -> None:
+    """
+    Require the current user to own the execution's workflow.
+
+    The owner is cached per execution, so repeated calls for one execution
+    (status polling, debugger stepping) skip the database; a miss costs a
+    single join instead of loading the execution and then its workflow.
+    """
+    owner_id = get_execution_owner_id(execution_id)
+    if owner_id is None:
+        row = session.exec(
+            select(WorkflowExecution.id, Workflow.owner_id)
+            .outerjoin(Workflow, Workflow.id == WorkflowExecution.workflow_id)
+            .where(WorkflowExecution.id == execution_id)
+        ).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Execution not found")
+        owner_id = row.owner_id
+        if owner_id is not None:
+            set_execution_owner_id(execution_id, owner_id)
+
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+
+def _get_workflow_owner_id(
+    session: Session, workflow_id: uuid.UUID
+) -> uuid.UUID | None:
+    """Get the owner of a workflow, or None if the workflow does not exist."""
+    return session.exec(
+        select(Workflow.owner_id).where(Workflow.id == workflow_id)
+    ).first()
+
+
+def _authorize_workflow(
+    session: Session, workflow_id: uuid.UUID, current_user: User
+) -> None:
+    """
+    Require the current user to own a workflow, or raise 404/403.
+
+    For routes that never use the workflow itself; reads the owner column
+    instead of loading the whole row.
+    """
+    owner_id = _get_workflow_owner_id(session, workflow_id)
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+
+def _get_owned_execution(
+    session: Session, execution_id: uuid.UUID, current_user: User
+) -> WorkflowExecution:
+    """
+    Load an execution owned by the current user, or raise 404/403.
+
+    The execution and its workflow's owner come back from a single join.
+    """
+    row = session.exec(
+        select(WorkflowExecution, Workflow.owner_id)
+        .outerjoin(Workflow, Workflow.id == WorkflowExecution.workflow_id)
+        .where(WorkflowExecution.id == execution_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Execution not found")
+
+    execution, owner_id = row
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    set_execution_owner_id(execution_id, owner_id)
+    return execution
+
+
+# Columns returned by the execution listings; selecting them directly skips
+# building ORM objects, and orjson encodes the UUIDs and datetimes as-is
+_EXECUTION_LIST_COLUMNS = (
+    WorkflowExecution.id,
+    WorkflowExecution.execution_id,
+    WorkflowExecution.status,
+    WorkflowExecution.started_at,
+    WorkflowExecution.completed_at,
+    WorkflowExecution.error_message,
+    WorkflowExecution.retry_count,
+)
+
+# Milliseconds between start and completion, NULL while still running;
+# truncated like the int() of the Python equivalent
+_EXECUTION_DURATION_MS = cast(
+    func.trunc(
+        func.extract(
+            "epoch", WorkflowExecution.completed_at - WorkflowExecution.started_at
+        )
+        * 1000
+    ),
+    BigInteger,
+).label("duration_ms")
+
+
+def _page_executions(
+    statement: Any,
+    skip: int,
+    limit: int,
+    after_started_at: datetime | None,
+    after_id: uuid.UUID | None,
+) -> Any:
+    """
+    Order an execution listing newest-first by (started_at, id) and page it.
+
+    With after_started_at and after_id (the last row of the previous page) the
+    page is a keyset seek; skip is kept for existing clients, but deep offsets
+    scan every skipped row.
+    """
+    statement = statement.order_by(
+        WorkflowExecution.started_at.desc(), WorkflowExecution.id.desc()
+    ).limit(limit)
+    if after_started_at and after_id:
+        return statement.where(
+            tuple_(WorkflowExecution.started_at, WorkflowExecution.id)
+            < tuple_(after_started_at, after_id)
+        )
+    return statement.offset(skip)
+
+
 @router.post("/", response_model=WorkflowPublic, status_code=201)
 def create_workflow(
     workflow_in: WorkflowCreate,
@@ -48,15 +219,19 @@ def create_workflow(
     Includes proper error handling, logging, and transaction management.
     """
     logger.info(
-        f"Creating workflow: name='{workflow_in.name}', "
-        f"user_id={current_user.id}, "
-        f"has_graph_config={bool(workflow_in.graph_config)}, "
-        f"has_trigger_config={bool(workflow_in.trigger_config)}"
+        "Creating workflow: name='%s', user_id=%s, has_graph_config=%s, "
+        "has_trigger_config=%s",
+        workflow_in.name,
+        current_user.id,
+        bool(workflow_in.graph_config),
+        bool(workflow_in.trigger_config),
     )
 
-    # Quick database connectivity check
-    if not check_db_connectivity():
-        logger.error("Database connectivity check failed before creating workflow")
+    # Fail fast while the database circuit breaker is open; this reads local
+    # state only, since probing would hold a second pooled connection per
+    # request and pool_pre_ping already validates the one used below
+    if get_circuit_breaker_status()["is_open"]:
+        logger.error("Database circuit breaker open, not creating workflow")
         raise HTTPException(
             status_code=503,
             detail="Database is currently unavailable. Please try again later.",
@@ -69,13 +244,14 @@ def create_workflow(
                 status_code=400, detail="Workflow name is required and cannot be empty"
             )
 
-        # Create workflow object
+        # Create workflow object from the already-validated fields; a shallow
+        # copy, since model_dump() would deep-copy the graph and trigger configs
         workflow = Workflow(
-            **workflow_in.model_dump(),
+            **dict(workflow_in),
             owner_id=current_user.id,
         )
 
-        logger.debug(f"Workflow object created: {workflow.id}")
+        logger.debug("Workflow object created: %s", workflow.id)
 
         # Add to session
         session.add(workflow)
@@ -85,13 +261,18 @@ def create_workflow(
         try:
             session.commit()
             logger.info(
-                f"Workflow created successfully: id={workflow.id}, name='{workflow.name}'"
+                "Workflow created successfully: id=%s, name='%s'",
+                workflow.id,
+                workflow.name,
             )
         except IntegrityError as e:
             session.rollback()
             logger.error(
-                f"Database integrity error creating workflow: {str(e)}, "
-                f"user_id={current_user.id}, workflow_name='{workflow_in.name}'"
+                "Database integrity error creating workflow: %s, "
+                "user_id=%s, workflow_name='%s'",
+                e,
+                current_user.id,
+                workflow_in.name,
             )
             # Check for specific constraint violations
             error_msg = str(e.orig) if hasattr(e, "orig") else str(e)
@@ -115,8 +296,11 @@ def create_workflow(
         except OperationalError as e:
             session.rollback()
             logger.error(
-                f"Database operational error creating workflow: {str(e)}, "
-                f"user_id={current_user.id}, workflow_name='{workflow_in.name}'"
+                "Database operational error creating workflow: %s, "
+                "user_id=%s, workflow_name='%s'",
+                e,
+                current_user.id,
+                workflow_in.name,
             )
             # Check for connection/timeout issues
             error_msg = str(e.orig) if hasattr(e, "orig") else str(e)
@@ -133,8 +317,10 @@ def create_workflow(
         except SQLAlchemyError as e:
             session.rollback()
             logger.error(
-                f"Database error creating workflow: {str(e)}, "
-                f"user_id={current_user.id}, workflow_name='{workflow_in.name}'",
+                "Database error creating workflow: %s, user_id=%s, workflow_name='%s'",
+                e,
+                current_user.id,
+                workflow_in.name,
                 exc_info=True,
             )
             raise HTTPException(
@@ -142,9 +328,9 @@ def create_workflow(
                 detail="Failed to create workflow due to database error",
             )
 
-        # Track workflow creation in PostHog
-        from app.observability.posthog import default_posthog_client
+        invalidate_workflow_list_cache(current_user.id)
 
+        # Track workflow creation in PostHog
         default_posthog_client.capture(
             distinct_id=str(current_user.id),
             event="workflow_created",
@@ -159,11 +345,12 @@ def create_workflow(
         # Refresh to get database-generated fields
         try:
             session.refresh(workflow)
-            logger.debug(f"Workflow refreshed: id={workflow.id}")
+            logger.debug("Workflow refreshed: id=%s", workflow.id)
         except SQLAlchemyError as e:
             logger.warning(
-                f"Failed to refresh workflow after creation: {str(e)}, "
-                f"workflow_id={workflow.id}"
+                "Failed to refresh workflow after creation: %s, workflow_id=%s",
+                e,
+                workflow.id,
             )
             # Workflow was created, so we can still return it
 
@@ -180,8 +367,10 @@ def create_workflow(
             pass  # Ignore rollback errors if session is already closed
 
         logger.error(
-            f"Unexpected error creating workflow: {str(e)}, "
-            f"user_id={current_user.id}, workflow_name='{workflow_in.name}'",
+            "Unexpected error creating workflow: %s, user_id=%s, workflow_name='%s'",
+            e,
+            current_user.id,
+            workflow_in.name,
             exc_info=True,
         )
         raise HTTPException(
@@ -200,14 +389,19 @@ def read_workflows(
     """
     Get all workflows for the current user.
     """
-    statement = (
-        select(Workflow)
-        .where(Workflow.owner_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
-    )
-    workflows = session.exec(statement).all()
-    return list(workflows)
+    # Pages are cached already serialized; writes to the owner's workflows
+    # invalidate them
+    body = get_cached_workflow_list(current_user.id, skip, limit)
+    if body is None:
+        statement = (
+            select(Workflow)
+            .where(Workflow.owner_id == current_user.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        workflows = session.exec(statement).all()
+        body = cache_workflow_list(current_user.id, skip, limit, list(workflows))
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/executions/failed")
@@ -217,44 +411,33 @@ def list_failed_executions(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=1000),
     retry_count_min: int | None = Query(None, ge=0),
+    after_started_at: datetime | None = Query(None),
+    after_id: uuid.UUID | None = Query(None),
 ) -> Any:
     """
     List all failed executions (admin only).
 
     Returns executions with status='failed', optionally filtered by retry count.
+    To fetch the next page, pass the last execution's started_at and id as
+    after_started_at and after_id.
     """
     # Check if user is superuser
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    statement = select(WorkflowExecution).where(WorkflowExecution.status == "failed")
+    statement = select(*_EXECUTION_LIST_COLUMNS, WorkflowExecution.workflow_id).where(
+        WorkflowExecution.status == "failed"
+    )
 
     if retry_count_min is not None:
         statement = statement.where(WorkflowExecution.retry_count >= retry_count_min)
 
-    statement = (
-        statement.order_by(WorkflowExecution.started_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    executions = session.exec(statement).all()
+    statement = _page_executions(statement, skip, limit, after_started_at, after_id)
+    executions = [row._asdict() for row in session.exec(statement)]
+    for execution in executions:
+        execution["next_retry_at"] = None  # TODO: Implement retry scheduling
 
-    return [
-        {
-            "id": str(execution.id),
-            "execution_id": execution.execution_id,
-            "workflow_id": str(execution.workflow_id),
-            "status": execution.status,
-            "started_at": execution.started_at.isoformat(),
-            "completed_at": execution.completed_at.isoformat()
-            if execution.completed_at
-            else None,
-            "error_message": execution.error_message,
-            "retry_count": execution.retry_count,
-            "next_retry_at": None,  # TODO: Implement retry scheduling
-        }
-        for execution in executions
-    ]
+    return ORJSONResponse(executions)
 
 
 @router.get("/executions")
@@ -264,58 +447,43 @@ def list_all_executions(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=1000),
     workflow_id: uuid.UUID | None = Query(None),
+    after_started_at: datetime | None = Query(None),
+    after_id: uuid.UUID | None = Query(None),
 ) -> Any:
     """
     List all workflow executions.
 
     For regular users: returns only their own executions.
     For admins: returns all executions (or filtered by workflow_id).
+    To fetch the next page, pass the last execution's started_at and id as
+    after_started_at and after_id.
     """
     if current_user.is_superuser:
         # Admin can see all executions
-        statement = select(WorkflowExecution)
+        statement = select(
+            *_EXECUTION_LIST_COLUMNS,
+            WorkflowExecution.workflow_id,
+            _EXECUTION_DURATION_MS,
+        )
         if workflow_id:
             statement = statement.where(WorkflowExecution.workflow_id == workflow_id)
     else:
         # Regular users see only their own executions
         statement = (
-            select(WorkflowExecution)
+            select(
+                *_EXECUTION_LIST_COLUMNS,
+                WorkflowExecution.workflow_id,
+                _EXECUTION_DURATION_MS,
+            )
             .join(Workflow)
             .where(Workflow.owner_id == current_user.id)
         )
         if workflow_id:
             statement = statement.where(WorkflowExecution.workflow_id == workflow_id)
 
-    statement = (
-        statement.order_by(WorkflowExecution.started_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    executions = session.exec(statement).all()
-
-    return [
-        {
-            "id": str(execution.id),
-            "execution_id": execution.execution_id,
-            "workflow_id": str(execution.workflow_id),
-            "status": execution.status,
-            "started_at": execution.started_at.isoformat(),
-            "completed_at": execution.completed_at.isoformat()
-            if execution.completed_at
-            else None,
-            "error_message": execution.error_message,
-            "retry_count": execution.retry_count,
-            "duration_ms": (
-                int(
-                    (execution.completed_at - execution.started_at).total_seconds()
-                    * 1000
-                )
-                if execution.completed_at and execution.started_at
-                else None
-            ),
-        }
-        for execution in executions
-    ]
+    statement = _page_executions(statement, skip, limit, after_started_at, after_id)
+    executions = session.exec(statement).mappings().all()
+    return ORJSONResponse([dict(execution) for execution in executions])
 
 
 @router.get("/by-workflow/{workflow_id}/executions")
@@ -325,41 +493,28 @@ def get_workflow_executions(
     current_user: CurrentUser,
     skip: int = 0,
     limit: int = 100,
+    after_started_at: datetime | None = None,
+    after_id: uuid.UUID | None = None,
 ) -> Any:
     """
     Get all executions for a workflow.
-    """
-    workflow = session.get(Workflow, workflow_id)
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
 
-    # Check ownership
-    if workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    statement = (
-        select(WorkflowExecution)
-        .where(WorkflowExecution.workflow_id == workflow_id)
-        .order_by(WorkflowExecution.started_at.desc())
-        .offset(skip)
-        .limit(limit)
+    To fetch the next page, pass the last execution's started_at and id as
+    after_started_at and after_id.
+    """
+    _authorize_workflow(session, workflow_id, current_user)
+
+    statement = _page_executions(
+        select(*_EXECUTION_LIST_COLUMNS).where(
+            WorkflowExecution.workflow_id == workflow_id
+        ),
+        skip,
+        limit,
+        after_started_at,
+        after_id,
     )
-    executions = session.exec(statement).all()
-
-    return [
-        {
-            "id": str(execution.id),
-            "execution_id": execution.execution_id,
-            "status": execution.status,
-            "started_at": execution.started_at.isoformat(),
-            "completed_at": execution.completed_at.isoformat()
-            if execution.completed_at
-            else None,
-            "error_message": execution.error_message,
-            "retry_count": execution.retry_count,
-        }
-        for execution in executions
-    ]
+    executions = [row._asdict() for row in session.exec(statement)]
+    return ORJSONResponse(executions)
 
 
 @router.get("/executions/{execution_id}/status")
@@ -371,14 +526,7 @@ def get_execution_status(
     """
     Get execution status and details.
     """
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    # Check ownership via workflow
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     # Get execution summary
     summary = history.get_execution_summary(session, execution_id)
@@ -398,33 +546,30 @@ def get_execution_logs(
     """
     Get execution logs.
     """
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    # Check ownership via workflow
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    logs = history.get_execution_logs(
-        session,
-        execution_id,
-        node_id=node_id,
-        level=level,
-        limit=limit,
-    )
+    _authorize_execution(session, execution_id, current_user)
+    # The stream reads on its own session, since depending on the FastAPI
+    # version the request session is closed before or after the body is
+    # sent; release its connection now rather than hold two
+    session.close()
+
+    def stream_logs() -> Iterator[bytes]:
+        with Session(engine) as log_session:
+            yield b"["
+            for index, log in enumerate(
+                history.iter_execution_logs(
+                    log_session,
+                    execution_id,
+                    node_id=node_id,
+                    level=level,
+                    limit=limit,
+                )
+            ):
+                if index:
+                    yield b","
+                yield orjson.dumps(log)
+            yield b"]"
 
-    return [
-        {
-            "id": str(log.id),
-            "node_id": log.node_id,
-            "level": log.level,
-            "message": log.message,
-            "timestamp": log.timestamp.isoformat(),
-        }
-        for log in logs
-    ]
+    return StreamingResponse(stream_logs(), media_type="application/json")
 
 
 @router.get("/executions/{execution_id}/timeline")
@@ -436,14 +581,7 @@ def get_execution_timeline(
     """
     Get complete execution timeline.
     """
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    # Check ownership via workflow
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     timeline = history.get_execution_timeline(session, execution_id)
     return timeline
@@ -462,14 +600,7 @@ def replay_execution(
     Creates a new execution based on the original, optionally starting
     from a specific node.
     """
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    # Check ownership via workflow
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     try:
         new_execution_id = history.replay_execution(
@@ -477,14 +608,18 @@ def replay_execution(
             execution_id,
             from_node_id=from_node_id,
         )
+        # The replay runs the same workflow, so the client's follow-up polling
+        # of the new execution is authorized from the cache
+        set_execution_owner_id(new_execution_id, current_user.id)
+        invalidate_analytics_cache(current_user.id)
 
         new_execution = session.get(WorkflowExecution, new_execution_id)
 
         return {
             "execution_id": new_execution.execution_id,
-            "id": str(new_execution.id),
+            "id": new_execution.id,
             "status": new_execution.status,
-            "started_at": new_execution.started_at.isoformat(),
+            "started_at": new_execution.started_at,
             "replay_from": from_node_id,
         }
     except Exception as e:
@@ -500,14 +635,7 @@ def pause_execution(
     """
     Pause a running execution.
     """
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    # Check ownership via workflow
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    execution = _get_owned_execution(session, execution_id, current_user)
 
     try:
         workflow_engine.pause_execution(session, execution_id)
@@ -525,14 +653,7 @@ def resume_execution(
     """
     Resume a paused execution.
     """
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    # Check ownership via workflow
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    execution = _get_owned_execution(session, execution_id, current_user)
 
     try:
         workflow_engine.resume_execution(session, execution_id)
@@ -550,7 +671,6 @@ async def execution_websocket(
     """
     WebSocket endpoint for real-time execution updates.
     """
-    from app.workflows.websocket import websocket_endpoint
 
     # TODO: Validate token and get user_id
     await websocket_endpoint(websocket, str(execution_id), None)
@@ -567,10 +687,6 @@ async def webhook_trigger(
 
     Accepts webhook requests and triggers associated workflows.
     """
-    from app.workflows.webhook_triggers import (
-        WebhookTriggerError,
-        default_webhook_trigger_manager,
-    )
 
     try:
         # Get payload
@@ -587,8 +703,10 @@ async def webhook_trigger(
             or headers.get("signature")
         )
 
-        # Trigger workflow
-        execution_id = default_webhook_trigger_manager.trigger_workflow_from_webhook(
+        # Trigger workflow; the lookups and inserts are blocking, so they run in
+        # the threadpool rather than stalling the event loop
+        execution_id = await run_in_threadpool(
+            default_webhook_trigger_manager.trigger_workflow_from_webhook,
             session,
             f"/{webhook_path}",
             payload,
@@ -598,14 +716,14 @@ async def webhook_trigger(
 
         return {
             "status": "triggered",
-            "execution_id": str(execution_id),
+            "execution_id": execution_id,
             "webhook_path": webhook_path,
         }
 
     except WebhookTriggerError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Webhook trigger error: {e}")
+        logger.error("Webhook trigger error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -623,18 +741,8 @@ def create_webhook_subscription(
     """
     Create a webhook subscription for a workflow.
     """
-    from app.workflows.webhook_triggers import (
-        WebhookTriggerError,
-        default_webhook_trigger_manager,
-    )
 
-    # Verify workflow ownership
-    workflow = session.get(Workflow, workflow_id)
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-
-    if workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_workflow(session, workflow_id, current_user)
 
     try:
         subscription = default_webhook_trigger_manager.create_webhook_subscription(
@@ -647,17 +755,17 @@ def create_webhook_subscription(
         )
 
         return {
-            "id": str(subscription.id),
-            "workflow_id": str(subscription.workflow_id),
+            "id": subscription.id,
+            "workflow_id": subscription.workflow_id,
             "webhook_path": subscription.webhook_path,
             "is_active": subscription.is_active,
-            "created_at": subscription.created_at.isoformat(),
+            "created_at": subscription.created_at,
         }
 
     except WebhookTriggerError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error creating webhook subscription: {e}")
+        logger.error("Error creating webhook subscription: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -673,19 +781,12 @@ def enable_debug_mode(
     current_user: CurrentUser,
 ) -> Any:
     """Enable debug mode for an execution."""
-    from app.workflows.debugging import DebuggerError, default_debugger
 
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     try:
         default_debugger.enable_debug_mode(session, execution_id)
-        return {"status": "debug_enabled", "execution_id": str(execution_id)}
+        return {"status": "debug_enabled", "execution_id": execution_id}
     except DebuggerError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -697,19 +798,12 @@ def disable_debug_mode(
     current_user: CurrentUser,
 ) -> Any:
     """Disable debug mode for an execution."""
-    from app.workflows.debugging import DebuggerError, default_debugger
 
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     try:
         default_debugger.disable_debug_mode(session, execution_id)
-        return {"status": "debug_disabled", "execution_id": str(execution_id)}
+        return {"status": "debug_disabled", "execution_id": execution_id}
     except DebuggerError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -721,15 +815,8 @@ def debug_step(
     current_user: CurrentUser,
 ) -> Any:
     """Execute next step in debug mode."""
-    from app.workflows.debugging import DebuggerError, default_debugger
 
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     try:
         result = default_debugger.step_over(session, execution_id)
@@ -747,24 +834,37 @@ def set_breakpoint(
     current_user: CurrentUser,
 ) -> Any:
     """Set breakpoint at a node."""
-    from app.workflows.debugging import default_debugger
-
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
 
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     default_debugger.set_breakpoint(execution_id, node_id)
     return {
         "status": "breakpoint_set",
-        "execution_id": str(execution_id),
+        "execution_id": execution_id,
         "node_id": node_id,
     }
 
 
+@router.post("/executions/{execution_id}/debug/breakpoints", status_code=200)
+def set_breakpoints(
+    execution_id: uuid.UUID,
+    node_ids: list[str] = Body(...),
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+) -> Any:
+    """Set breakpoints at several nodes in one request."""
+
+    _authorize_execution(session, execution_id, current_user)
+
+    default_debugger.set_breakpoints(execution_id, node_ids)
+    return {
+        "status": "breakpoints_set",
+        "execution_id": execution_id,
+        "node_ids": node_ids,
+    }
+
+
 @router.delete("/executions/{execution_id}/debug/breakpoint/{node_id}", status_code=200)
 def remove_breakpoint(
     execution_id: uuid.UUID,
@@ -773,20 +873,13 @@ def remove_breakpoint(
     current_user: CurrentUser,
 ) -> Any:
     """Remove breakpoint at a node."""
-    from app.workflows.debugging import default_debugger
 
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     default_debugger.remove_breakpoint(execution_id, node_id)
     return {
         "status": "breakpoint_removed",
-        "execution_id": str(execution_id),
+        "execution_id": execution_id,
         "node_id": node_id,
     }
 
@@ -800,18 +893,11 @@ def get_debug_variables(
     current_user: CurrentUser,
 ) -> Any:
     """Inspect variables in execution."""
-    from app.workflows.debugging import default_debugger
-
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
 
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     variables = default_debugger.inspect_variables(session, execution_id, scope)
-    return {"execution_id": str(execution_id), "scope": scope, "variables": variables}
+    return {"execution_id": execution_id, "scope": scope, "variables": variables}
 
 
 @router.get("/executions/{execution_id}/debug/state", status_code=200)
@@ -821,15 +907,8 @@ def get_debug_state(
     current_user: CurrentUser,
 ) -> Any:
     """Inspect execution state."""
-    from app.workflows.debugging import default_debugger
-
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
 
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     state = default_debugger.inspect_execution_state(session, execution_id)
     return state
@@ -850,7 +929,6 @@ def test_workflow(
     current_user: CurrentUser,
 ) -> Any:
     """Run workflow in test mode."""
-    from app.workflows.testing import TestExecutionError, default_test_runner
 
     workflow = session.get(Workflow, workflow_id)
     if not workflow:
@@ -877,15 +955,8 @@ def validate_test_result(
     current_user: CurrentUser,
 ) -> Any:
     """Validate test execution result."""
-    from app.workflows.testing import default_test_runner
 
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _authorize_execution(session, execution_id, current_user)
 
     result = default_test_runner.validate_test_result(
         session, execution_id, expected_outputs
@@ -898,6 +969,55 @@ def validate_test_result(
 # ============================================================================
 
 
+def _require_analytics_access(
+    session: Session, workflow_id: uuid.UUID | None, current_user: User
+) -> None:
+    """
+    Reject analytics for a workflow the current user does not own.
+
+    Analytics queries are already scoped to the user's workflows, so this is
+    only needed to tell an empty result apart from someone else's workflow.
+    """
+    if workflow_id is None:
+        return
+    if _get_workflow_owner_id(session, workflow_id) != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+
+def _cached_analytics(
+    session: Session,
+    background_tasks: BackgroundTasks,
+    key: str,
+    compute: Callable[[Session], Any],
+) -> Any:
+    """
+    Serve an analytics result from the cache, computing it on a miss.
+
+    Stale entries are still served while one request recomputes them after
+    the response is sent. compute() runs the access check itself, so only
+    results the user was allowed to see are ever cached.
+    """
+    cached = get_cached_analytics(key)
+    if cached is None:
+        result = compute(session)
+        cache_analytics(key, result)
+        return result
+
+    result, needs_refresh = cached
+    if needs_refresh and claim_analytics_refresh(key):
+        background_tasks.add_task(_refresh_analytics, key, compute)
+    return result
+
+
+def _refresh_analytics(key: str, compute: Callable[[Session], Any]) -> None:
+    # Runs after the response, so it needs its own session
+    try:
+        with Session(engine) as session:
+            cache_analytics(key, compute(session))
+    except Exception as e:
+        logger.warning("Failed to refresh analytics %s: %s", key, e)
+
+
 @router.get("/analytics/stats", status_code=200)
 def get_execution_stats(
     workflow_id: uuid.UUID | None = Query(None),
@@ -906,37 +1026,23 @@ def get_execution_stats(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    background_tasks: BackgroundTasks,
 ) -> Any:
     """Get execution statistics."""
-    from app.workflows.analytics import default_analytics
 
-    # Filter by user's workflows if workflow_id not specified
-    if workflow_id:
-        workflow = session.get(Workflow, workflow_id)
-        if not workflow or workflow.owner_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-    else:
-        # Get all user's workflows
-        from sqlmodel import select
-
-        user_workflows = session.exec(
-            select(Workflow).where(Workflow.owner_id == current_user.id)
-        ).all()
-        if not user_workflows:
-            return {
-                "total_executions": 0,
-                "completed": 0,
-                "failed": 0,
-                "running": 0,
-                "success_rate": 0,
-                "failure_rate": 0,
-                "avg_duration_seconds": 0,
-            }
+    def compute(session: Session) -> dict[str, Any]:
+        # Scoped to the user's workflows, so a user without any gets all zeros
+        stats = default_analytics.get_execution_stats(
+            session, workflow_id, start_date, end_date, owner_id=current_user.id
+        )
+        if not stats["total_executions"]:
+            _require_analytics_access(session, workflow_id, current_user)
+        return stats
 
-    stats = default_analytics.get_execution_stats(
-        session, workflow_id, start_date, end_date
+    key = analytics_cache_key(
+        "stats", current_user.id, workflow_id, start_date=start_date, end_date=end_date
     )
-    return stats
+    return _cached_analytics(session, background_tasks, key, compute)
 
 
 @router.get("/analytics/performance", status_code=200)
@@ -946,37 +1052,72 @@ def get_performance_metrics(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    background_tasks: BackgroundTasks,
 ) -> Any:
     """Get performance metrics."""
-    from app.workflows.analytics import default_analytics
 
-    if workflow_id:
-        workflow = session.get(Workflow, workflow_id)
-        if not workflow or workflow.owner_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
+    def compute(session: Session) -> dict[str, Any]:
+        metrics = default_analytics.get_performance_metrics(
+            session, workflow_id, days, owner_id=current_user.id
+        )
+        if not metrics["total_executions"]:
+            _require_analytics_access(session, workflow_id, current_user)
+        return metrics
 
-    metrics = default_analytics.get_performance_metrics(session, workflow_id, days)
-    return metrics
+    key = analytics_cache_key("performance", current_user.id, workflow_id, days=days)
+    return _cached_analytics(session, background_tasks, key, compute)
 
 
-@router.get("/analytics/trends", status_code=200)
+@router.get(
+    "/analytics/trends",
+    status_code=200,
+    response_model=None,
+    responses={200: {"model": dict[str, Any]}, 304: {"description": "Not Modified"}},
+)
 def get_usage_trends(
     workflow_id: uuid.UUID | None = Query(None),
     days: int = Query(30, ge=1, le=365),
+    offset: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, le=365),
+    if_none_match: str | None = Header(default=None),
     *,
     session: SessionDep,
     current_user: CurrentUser,
-) -> Any:
-    """Get usage trends over time."""
-    from app.workflows.analytics import default_analytics
+    background_tasks: BackgroundTasks,
+) -> Response:
+    """
+    Get usage trends over time.
 
-    if workflow_id:
-        workflow = session.get(Workflow, workflow_id)
-        if not workflow or workflow.owner_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
+    offset and limit select a slice of the daily series; only that slice is
+    aggregated. Responses carry an ETag of their content, so a poll that
+    sends it back in If-None-Match gets an empty 304 while nothing changed.
+    """
 
-    trends = default_analytics.get_usage_trends(session, workflow_id, days)
-    return {"trends": trends}
+    def compute(session: Session) -> dict[str, Any]:
+        trends = default_analytics.get_usage_trends(
+            session,
+            workflow_id,
+            days,
+            owner_id=current_user.id,
+            offset=offset,
+            limit=limit,
+        )
+        if not any(day["total_executions"] for day in trends):
+            _require_analytics_access(session, workflow_id, current_user)
+        return {"trends": trends}
+
+    key = analytics_cache_key(
+        f"trends:{offset}:{limit}", current_user.id, workflow_id, days=days
+    )
+    body = orjson.dumps(_cached_analytics(session, background_tasks, key, compute))
+    headers = {
+        "ETag": f'"{hashlib.sha256(body).hexdigest()[:16]}"',
+        # Per-user data, fresh for as long as the analytics cache serves it
+        "Cache-Control": f"private, max-age={ANALYTICS_REFRESH_AFTER_SECONDS}",
+    }
+    if if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/analytics/cost", status_code=200)
@@ -986,17 +1127,20 @@ def get_cost_estimate(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    background_tasks: BackgroundTasks,
 ) -> Any:
     """Get cost estimate."""
-    from app.workflows.analytics import default_analytics
 
-    if workflow_id:
-        workflow = session.get(Workflow, workflow_id)
-        if not workflow or workflow.owner_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
+    def compute(session: Session) -> dict[str, Any]:
+        cost = default_analytics.get_cost_estimate(
+            session, workflow_id, days, owner_id=current_user.id
+        )
+        if not cost["total_executions"]:
+            _require_analytics_access(session, workflow_id, current_user)
+        return cost
 
-    cost = default_analytics.get_cost_estimate(session, workflow_id, days)
-    return cost
+    key = analytics_cache_key("cost", current_user.id, workflow_id, days=days)
+    return _cached_analytics(session, background_tasks, key, compute)
 
 
 # ============================================================================
@@ -1013,7 +1157,6 @@ def add_workflow_dependency(
     current_user: CurrentUser,
 ) -> Any:
     """Add a dependency to a workflow."""
-    from app.workflows.dependencies import DependencyError, default_dependency_manager
 
     workflow = session.get(Workflow, workflow_id)
     if not workflow:
@@ -1026,11 +1169,14 @@ def add_workflow_dependency(
         default_dependency_manager.add_dependency(
             session, workflow_id, depends_on_workflow_id
         )
-        return {
-            "status": "dependency_added",
-            "workflow_id": str(workflow_id),
-            "depends_on": str(depends_on_workflow_id),
-        }
+        invalidate_workflow_list_cache(current_user.id)
+        return ORJSONResponse(
+            {
+                "status": "dependency_added",
+                "workflow_id": workflow_id,
+                "depends_on": depends_on_workflow_id,
+            }
+        )
     except DependencyError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1043,7 +1189,6 @@ def remove_workflow_dependency(
     current_user: CurrentUser,
 ) -> Any:
     """Remove a dependency from a workflow."""
-    from app.workflows.dependencies import default_dependency_manager
 
     workflow = session.get(Workflow, workflow_id)
     if not workflow:
@@ -1055,11 +1200,14 @@ def remove_workflow_dependency(
     default_dependency_manager.remove_dependency(
         session, workflow_id, depends_on_workflow_id
     )
-    return {
-        "status": "dependency_removed",
-        "workflow_id": str(workflow_id),
-        "depends_on": str(depends_on_workflow_id),
-    }
+    invalidate_workflow_list_cache(current_user.id)
+    return ORJSONResponse(
+        {
+            "status": "dependency_removed",
+            "workflow_id": workflow_id,
+            "depends_on": depends_on_workflow_id,
+        }
+    )
 
 
 @router.get("/{workflow_id}/dependencies", status_code=200)
@@ -1067,9 +1215,14 @@ def get_workflow_dependencies(
     workflow_id: uuid.UUID,
     session: SessionDep,
     current_user: CurrentUser,
+    transitive: bool = Query(False),
 ) -> Any:
-    """Get dependencies for a workflow."""
-    from app.workflows.dependencies import default_dependency_manager
+    """
+    Get dependencies for a workflow.
+
+    With transitive=true, also returns the dependencies of dependencies, all
+    the way down.
+    """
 
     workflow = session.get(Workflow, workflow_id)
     if not workflow:
@@ -1078,13 +1231,15 @@ def get_workflow_dependencies(
     if workflow.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    dependencies = default_dependency_manager.get_workflow_dependencies(
-        session, workflow_id
-    )
-    return {
-        "workflow_id": str(workflow_id),
-        "dependencies": [str(dep_id) for dep_id in dependencies],
-    }
+    if transitive:
+        dependencies = default_dependency_manager.get_transitive_dependencies(
+            session, workflow_id
+        )
+    else:
+        dependencies = default_dependency_manager.get_workflow_dependencies(
+            session, workflow_id
+        )
+    return ORJSONResponse({"workflow_id": workflow_id, "dependencies": dependencies})
 
 
 @router.post("/{workflow_id}/dependencies/validate", status_code=200)
@@ -1094,14 +1249,9 @@ def validate_dependencies(
     current_user: CurrentUser,
 ) -> Any:
     """Validate dependency graph for a workflow."""
-    from app.workflows.dependencies import default_dependency_manager
 
-    workflow = session.get(Workflow, workflow_id)
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-
-    if workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    # The graph is loaded column-only, so the workflow row is never needed
+    _authorize_workflow(session, workflow_id, current_user)
 
     is_valid, errors = default_dependency_manager.validate_dependency_graph(
         session, workflow_id
@@ -1124,11 +1274,9 @@ def get_monitoring_metrics(
     current_user: CurrentUser,
 ) -> Any:
     """Get monitoring metrics."""
-    from app.workflows.monitoring import default_workflow_monitor
 
     if workflow_id:
-        workflow = session.get(Workflow, workflow_id)
-        if not workflow or workflow.owner_id != current_user.id:
+        if _get_workflow_owner_id(session, workflow_id) != current_user.id:
             raise HTTPException(status_code=403, detail="Not enough permissions")
 
     metrics = default_workflow_monitor.get_execution_metrics(
@@ -1147,18 +1295,12 @@ def terminate_execution(
     """
     Terminate a running or paused execution.
     """
-    execution = session.get(WorkflowExecution, execution_id)
-    if not execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-
-    # Check ownership via workflow
-    workflow = session.get(Workflow, execution.workflow_id)
-    if not workflow or workflow.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    execution = _get_owned_execution(session, execution_id, current_user)
 
     try:
         workflow_engine.terminate_execution(session, execution_id, reason=reason)
         session.commit()
+        invalidate_analytics_cache(current_user.id)
         return {"status": "terminated", "execution_id": execution.execution_id}
     except Exception as e:
         session.rollback()
@@ -1211,6 +1353,7 @@ def update_workflow(
     session.add(workflow)
     session.commit()
     session.refresh(workflow)
+    invalidate_workflow_list_cache(current_user.id)
     return workflow
 
 
@@ -1233,6 +1376,7 @@ def delete_workflow(
 
     session.delete(workflow)
     session.commit()
+    invalidate_workflow_list_cache(current_user.id)
 
 
 @router.post("/{workflow_id}/run", status_code=201)
@@ -1267,10 +1411,9 @@ def run_workflow(
             workflow_id,
             trigger_data=trigger_data,
         )
+        invalidate_analytics_cache(current_user.id)
 
         # Track workflow execution in PostHog
-        from app.observability.posthog import default_posthog_client
-
         default_posthog_client.capture(
             distinct_id=str(current_user.id),
             event="workflow_executed",
@@ -1284,9 +1427,9 @@ def run_workflow(
 
         return {
             "execution_id": execution.execution_id,
-            "id": str(execution.id),
+            "id": execution.id,
             "status": execution.status,
-            "started_at": execution.started_at.isoformat(),
+            "started_at": execution.started_at,
         }
     except WorkflowNotFoundError:
         raise HTTPException(status_code=404, detail="Workflow not found")
@@ -7,11 +7,21 @@ In-memory and Redis-based caching service for performance optimization.
 import hashlib
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Callable
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# The in-process tier is bounded: past this many entries the least recently
+# used are evicted. Expired entries are also swept periodically, since keys
+# that are never read again (orphaned by a generation bump, or belonging to a
+# finished execution) would otherwise only be dropped by a restart.
+MEMORY_CACHE_MAX_ENTRIES = 10_000
+MEMORY_CACHE_SWEEP_INTERVAL_SECONDS = 60
+
 
 class CacheService:
     """
@@ -26,7 +36,9 @@ class CacheService:
 
     def __init__(self):
         """Initialize cache service."""
-        self._memory_cache: dict[str, tuple[Any, float]] = {}
+        self._memory_cache: OrderedDict[str, tuple[Any, float | None]] = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._next_sweep_at = time.time() + MEMORY_CACHE_SWEEP_INTERVAL_SECONDS
         self._redis_available = False
         self._redis_client = None
         self._check_redis_availability()
@@ -59,6 +71,21 @@ class CacheService:
             self._redis_available = False
             self._redis_client = None
 
+    def _evict_locked(self) -> None:
+        """Sweep expired entries when due and enforce the size bound; hold the lock."""
+        now = time.time()
+        if now >= self._next_sweep_at:
+            self._next_sweep_at = now + MEMORY_CACHE_SWEEP_INTERVAL_SECONDS
+            expired = [
+                key
+                for key, (_, expiry) in self._memory_cache.items()
+                if expiry is not None and now >= expiry
+            ]
+            for key in expired:
+                del self._memory_cache[key]
+        while len(self._memory_cache) > MEMORY_CACHE_MAX_ENTRIES:
+            self._memory_cache.popitem(last=False)
+
     def _generate_key(self, prefix: str, *args, **kwargs) -> str:
         """
         Generate cache key from prefix and arguments.
@@ -92,13 +119,13 @@ class CacheService:
             Cached value or None if not found/expired
         """
         # Check memory cache first
-        if key in self._memory_cache:
-            value, expiry = self._memory_cache[key]
-            import time
-
-            if expiry is None or time.time() < expiry:
-                return value
-            else:
+        with self._memory_lock:
+            entry = self._memory_cache.get(key)
+            if entry is not None:
+                value, expiry = entry
+                if expiry is None or time.time() < expiry:
+                    self._memory_cache.move_to_end(key)
+                    return value
                 # Expired, remove from cache
                 del self._memory_cache[key]
 
@@ -118,6 +145,7 @@ class CacheService:
         key: str,
         value: Any,
         ttl_seconds: int | None = None,
+        local_copy: bool = True,
     ) -> None:
         """
         Set value in cache.
@@ -126,14 +154,19 @@ class CacheService:
             key: Cache key
             value: Value to cache
             ttl_seconds: Time-to-live in seconds (None for no expiration)
+            local_copy: Also keep the value in process memory. Pass False for
+                keys that are large or orphaned once invalidated; ignored
+                without Redis, where memory is the only tier
         """
-        import time
-
         # Set in memory cache
-        expiry = None
-        if ttl_seconds:
-            expiry = time.time() + ttl_seconds
-        self._memory_cache[key] = (value, expiry)
+        if local_copy or not (self._redis_available and self._redis_client):
+            expiry = None
+            if ttl_seconds:
+                expiry = time.time() + ttl_seconds
+            with self._memory_lock:
+                self._memory_cache[key] = (value, expiry)
+                self._memory_cache.move_to_end(key)
+                self._evict_locked()
 
         # Set in Redis if available
         if self._redis_available and self._redis_client:
@@ -154,8 +187,8 @@ class CacheService:
             key: Cache key
         """
         # Delete from memory cache
-        if key in self._memory_cache:
-            del self._memory_cache[key]
+        with self._memory_lock:
+            self._memory_cache.pop(key, None)
 
         # Delete from Redis if available
         if self._redis_available and self._redis_client:
@@ -173,11 +206,12 @@ class CacheService:
         """
         if prefix:
             # Clear keys with prefix
-            keys_to_delete = [
-                key for key in self._memory_cache.keys() if key.startswith(prefix)
-            ]
-            for key in keys_to_delete:
-                del self._memory_cache[key]
+            with self._memory_lock:
+                keys_to_delete = [
+                    key for key in self._memory_cache.keys() if key.startswith(prefix)
+                ]
+                for key in keys_to_delete:
+                    del self._memory_cache[key]
 
             # Clear from Redis if available
             if self._redis_available and self._redis_client:
@@ -190,7 +224,8 @@ class CacheService:
                     logger.warning(f"Redis clear failed: {e}")
         else:
             # Clear all cache
-            self._memory_cache.clear()
+            with self._memory_lock:
+                self._memory_cache.clear()
 
             if self._redis_available and self._redis_client:
                 try:
@@ -198,6 +233,65 @@ class CacheService:
                 except Exception as e:
                     logger.warning(f"Redis flush failed: {e}")
 
+    def set_if_absent(self, key: str, value: Any, ttl_seconds: int) -> bool | None:
+        """
+        Atomically set a value only if the key does not exist yet (SET NX).
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Time-to-live in seconds
+
+        Returns:
+            True if the key was set, False if it already existed, or None if
+            Redis is unavailable and no shared answer can be given
+        """
+        if not self._redis_available or not self._redis_client:
+            return None
+
+        try:
+            value_json = json.dumps(value, default=str)
+            return bool(
+                self._redis_client.set(key, value_json, ex=ttl_seconds, nx=True)
+            )
+        except Exception as e:
+            logger.warning(f"Redis set-if-absent failed: {e}")
+            return None
+
+    def incr(self, key: str, ttl_seconds: int) -> int:
+        """
+        Increment a counter that expires ttl_seconds after its first increment.
+
+        Counts are shared through Redis when available and kept per process
+        otherwise, which makes this a fixed-window counter for rate limiting.
+
+        Args:
+            key: Cache key
+            ttl_seconds: Window length in seconds
+
+        Returns:
+            Counter value after the increment
+        """
+        if self._redis_available and self._redis_client:
+            try:
+                count = self._redis_client.incr(key)
+                if count == 1:
+                    self._redis_client.expire(key, ttl_seconds)
+                return int(count)
+            except Exception as e:
+                logger.warning(f"Redis incr failed: {e}")
+
+        now = time.time()
+        with self._memory_lock:
+            count, expiry = self._memory_cache.get(key, (0, None))
+            if expiry is None or now >= expiry:
+                count, expiry = 0, now + ttl_seconds
+            count += 1
+            self._memory_cache[key] = (count, expiry)
+            self._memory_cache.move_to_end(key)
+            self._evict_locked()
+        return count
+
     def get_or_set(
         self,
         key: str,
@@ -2,7 +2,7 @@ import logging
 import time
 from datetime import datetime, timedelta
 
-from sqlalchemy import event
+from sqlalchemy import event, make_url
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.pool import Pool
 from sqlmodel import Session, create_engine, select
@@ -17,24 +17,36 @@ logger = logging.getLogger(__name__)
 _circuit_breaker_open_until: datetime | None = None
 _circuit_breaker_wait_time = 300  # Wait 5 minutes when circuit breaker is detected
 
+# Supabase's transaction pooler (Supavisor, port 6543) hands each transaction
+# to whichever server connection is free, so a statement psycopg prepared on
+# one connection is missing on the next. psycopg prepares automatically after
+# a few executions, so preparing is turned off when connecting through it.
+TRANSACTION_POOLER_PORT = 6543
+
+_database_uri = str(settings.SQLALCHEMY_DATABASE_URI)
+_connect_args: dict = {
+    "connect_timeout": 10,  # REDUCED: 10 second connection timeout (fail fast)
+    "options": "-c statement_timeout=30000",  # 30 second statement timeout (in milliseconds)
+    "keepalives": 1,  # Enable TCP keepalives
+    "keepalives_idle": 30,  # Start keepalives after 30 seconds of inactivity
+    "keepalives_interval": 10,  # Send keepalives every 10 seconds
+    "keepalives_count": 5,  # Send up to 5 keepalives before considering connection dead
+}
+if make_url(_database_uri).port == TRANSACTION_POOLER_PORT:
+    _connect_args["prepare_threshold"] = None
+
 # Create engine with optimized connection pool settings
 # These settings minimize connection attempts to avoid triggering Supabase circuit breaker
 # REDUCED pool size to minimize authentication attempts
 engine = create_engine(
-    str(settings.SQLALCHEMY_DATABASE_URI),
+    _database_uri,
     pool_pre_ping=True,  # Verify connections before using them (prevents stale connections)
     pool_recycle=1800,  # Recycle connections after 30 minutes (shorter than default to avoid timeouts)
     pool_size=5,  # REDUCED: Maintain only 5 connections in the pool (minimizes auth attempts)
     max_overflow=2,  # REDUCED: Allow only 2 additional connections beyond pool_size (total: 7)
     pool_timeout=30,  # REDUCED: Wait up to 30 seconds for a connection from the pool
-    connect_args={
-        "connect_timeout": 10,  # REDUCED: 10 second connection timeout (fail fast)
-        "options": "-c statement_timeout=30000",  # 30 second statement timeout (in milliseconds)
-        "keepalives": 1,  # Enable TCP keepalives
-        "keepalives_idle": 30,  # Start keepalives after 30 seconds of inactivity
-        "keepalives_interval": 10,  # Send keepalives every 10 seconds
-        "keepalives_count": 5,  # Send up to 5 keepalives before considering connection dead
-    },
+    connect_args=_connect_args,
+    query_cache_size=1200,  # Compiled statement cache; default 500 is too small for all routes
     echo=False,  # Set to True for SQL query logging
 )
 
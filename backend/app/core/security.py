@@ -1,3 +1,5 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -8,6 +10,12 @@ from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately CPU-bound; a pool sized to the core count keeps
+# concurrent hashes from oversubscribing the CPU or the request threadpool
+password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="password-hash"
+)
+
 
 ALGORITHM = "HS256"
 
@@ -27,6 +35,18 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def get_password_hash_pooled(password: str) -> str:
+    """Hash on the bounded password executor, for sync request handlers."""
+    return password_executor.submit(get_password_hash, password).result()
+
+
+def verify_password_pooled(plain_password: str, hashed_password: str) -> bool:
+    """Verify on the bounded password executor, for sync request handlers."""
+    return password_executor.submit(
+        verify_password, plain_password, hashed_password
+    ).result()
+
+
 def generate_token(length: int = 32) -> str:
     """Generate a secure random token"""
     import secrets
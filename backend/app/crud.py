@@ -1,18 +1,27 @@
+import uuid
 from typing import Any
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import Session, select
 
+from app.cache import default_cache_service
 from app.core.security import get_password_hash, verify_password
-from app.models import User, UserCreate, UserUpdate
+from app.models import User, UserCreate, UserPreferences, UserUpdate
 
 
-def create_user(*, session: Session, user_create: UserCreate) -> User:
+def create_user(
+    *, session: Session, user_create: UserCreate, hashed_password: str | None = None
+) -> User:
+    # Request handlers hash ahead of time on the bounded password executor
+    if hashed_password is None:
+        hashed_password = get_password_hash(user_create.password)
     db_obj = User.model_validate(
-        user_create, update={"hashed_password": get_password_hash(user_create.password)}
+        user_create, update={"hashed_password": hashed_password}
     )
     session.add(db_obj)
     session.commit()
     session.refresh(db_obj)
+    invalidate_user_email_cache(db_obj.email)
     return db_obj
 
 
@@ -23,10 +32,13 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
         password = user_data["password"]
         hashed_password = get_password_hash(password)
         extra_data["hashed_password"] = hashed_password
+    previous_email = db_user.email
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
     session.commit()
     session.refresh(db_user)
+    if db_user.email != previous_email:
+        invalidate_user_email_cache(previous_email, db_user.email)
     return db_user
 
 
@@ -36,6 +48,87 @@ def get_user_by_email(*, session: Session, email: str) -> User | None:
     return session_user
 
 
+# How long the owner of an email address is cached for uniqueness checks
+USER_EMAIL_CACHE_TTL_SECONDS = 60
+
+
+def _user_email_cache_key(email: str) -> str:
+    return f"user_by_email:{email}"
+
+
+def invalidate_user_email_cache(*emails: str | None) -> None:
+    """Drop cached email owners after a user is created, deleted or renamed."""
+    for email in emails:
+        if email:
+            default_cache_service.delete(_user_email_cache_key(email))
+
+
+def user_email_exists(
+    *, session: Session, email: str, exclude_user_id: uuid.UUID | None = None
+) -> bool:
+    # The owning user id is cached so repeated checks for a taken address skip
+    # the database. Free addresses are not cached: invalidation cannot reach
+    # other workers' in-memory caches, and a stale "free" would let a duplicate
+    # through to the unique index.
+    key = _user_email_cache_key(email)
+    owner_id = default_cache_service.get(key)
+    if owner_id is None:
+        user_id = session.exec(select(User.id).where(User.email == email)).first()
+        if user_id is None:
+            return False
+        owner_id = str(user_id)
+        default_cache_service.set(
+            key, owner_id, ttl_seconds=USER_EMAIL_CACHE_TTL_SECONDS
+        )
+    return owner_id != str(exclude_user_id)
+
+
+def get_or_create_user_preferences(
+    *, session: Session, user_id: uuid.UUID
+) -> UserPreferences:
+    statement = select(UserPreferences).where(UserPreferences.user_id == user_id)
+    preferences = session.exec(statement).first()
+    if preferences:
+        return preferences
+
+    # INSERT ... ON CONFLICT DO NOTHING so concurrent first requests for the
+    # same user cannot race each other into a unique violation. The values come
+    # from a model instance so default_factory fields are populated too.
+    defaults = UserPreferences(user_id=user_id)
+    upsert = (
+        insert(UserPreferences)
+        .values(**defaults.model_dump())
+        .on_conflict_do_nothing(index_elements=["user_id"])
+        .returning(UserPreferences)
+    )
+    preferences = session.scalars(upsert).first()
+    session.commit()
+    if preferences:
+        return preferences
+    # Another request inserted the row first
+    return session.exec(statement).one()
+
+
+def set_user_avatar_url(
+    *, session: Session, user_id: uuid.UUID, avatar_url: str | None
+) -> str | None:
+    # Single INSERT ... ON CONFLICT DO UPDATE instead of load, modify, commit
+    # and refresh; creates the preferences row if the user has none yet
+    defaults = UserPreferences(user_id=user_id, avatar_url=avatar_url)
+    upsert = (
+        insert(UserPreferences)
+        .values(**defaults.model_dump())
+        .on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"avatar_url": avatar_url, "updated_at": defaults.updated_at},
+        )
+        .returning(UserPreferences.avatar_url)
+    )
+    stored_url = session.scalars(upsert).one()
+    session.commit()
+    return stored_url
+
+
 def authenticate(*, session: Session, email: str, password: str) -> User | None:
     db_user = get_user_by_email(session=session, email=email)
     if not db_user:
@@ -6,6 +6,7 @@ from starlette.middleware.cors import CORSMiddleware
 from app.api.main import api_router
 from app.api.middleware.csrf import CSRFMiddleware
 from app.api.middleware.guardrails import GuardrailsMiddleware
+from app.api.responses import ORJSONResponse
 from app.core.config import settings
 from app.observability.langfuse import default_langfuse_client
 from app.observability.opentelemetry import setup_opentelemetry
@@ -24,6 +25,7 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=ORJSONResponse,
 )
 
 # Set all CORS enabled origins
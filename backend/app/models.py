@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 from pydantic import EmailStr
-from sqlalchemy import JSON, Column, DateTime
+from sqlalchemy import JSON, Column, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlmodel import Field, Relationship, SQLModel
@@ -222,6 +222,10 @@ class UserSession(SQLModel, table=True):
     """User session tracking model"""
 
     __tablename__ = "user_session"
+    __table_args__ = (
+        # Active-session lookups filter on user_id + expires_at
+        Index("ix_usersession_user_expires", "user_id", "expires_at"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(
@@ -249,6 +253,17 @@ class LoginHistory(SQLModel, table=True):
     """Login history tracking model"""
 
     __tablename__ = "login_history"
+    __table_args__ = (
+        # Login history listing reads a user's newest rows in order
+        Index("ix_login_history_user_created", "user_id", text("created_at DESC")),
+        # Recent-successful-login checks only ever touch the newest rows
+        Index(
+            "ix_login_history_user_recent",
+            "user_id",
+            text("created_at DESC"),
+            postgresql_where=text("success = TRUE"),
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(
@@ -276,6 +291,7 @@ class UserPublic(UserBase):
 class UsersPublic(SQLModel):
     data: list[UserPublic]
     count: int
+    next_cursor: uuid.UUID | None = None
 
 
 # Generic message
@@ -328,7 +344,7 @@ class WorkflowUpdate(SQLModel):
 class Workflow(WorkflowBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_id: uuid.UUID = Field(
-        foreign_key="user.id", nullable=False, ondelete="CASCADE"
+        foreign_key="user.id", nullable=False, ondelete="CASCADE", index=True
     )
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -386,6 +402,23 @@ class WorkflowNode(SQLModel, table=True):
 
 
 class WorkflowExecution(SQLModel, table=True):
+    __table_args__ = (
+        # Per-workflow execution listing reads a workflow's newest runs in order;
+        # analytics windows count and average them from the index alone
+        Index(
+            "ix_workflowexecution_workflow_started_stats",
+            "workflow_id",
+            text("started_at DESC"),
+            postgresql_include=["status", "completed_at"],
+        ),
+        # Failed-execution listing only ever reads failed rows, newest first
+        Index(
+            "ix_workflowexecution_failed_started",
+            text("started_at DESC"),
+            postgresql_where=text("status = 'failed'"),
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     workflow_id: uuid.UUID = Field(
         foreign_key="workflow.id", nullable=False, ondelete="CASCADE"
@@ -1014,6 +1047,11 @@ class Team(SQLModel, table=True):
 class TeamMember(SQLModel, table=True):
     """Team member with role"""
 
+    __table_args__ = (
+        # Membership/permission checks filter on team_id + user_id
+        Index("ix_teammember_team_user", "team_id", "user_id", unique=True),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     team_id: uuid.UUID = Field(
         foreign_key="team.id", nullable=False, ondelete="CASCADE"
@@ -1059,6 +1097,42 @@ class TeamInvitation(SQLModel, table=True):
     inviter: User | None = Relationship(sa_relationship=relationship("User"))
 
 
+class TeamMemberPublic(SQLModel):
+    """Team member response (column fields only, no relationships)"""
+
+    id: uuid.UUID
+    team_id: uuid.UUID
+    user_id: uuid.UUID
+    role: str
+    joined_at: datetime
+    invited_by: uuid.UUID | None
+
+
+class TeamInvitationPublic(SQLModel):
+    """Team invitation response (column fields only, no relationships)"""
+
+    id: uuid.UUID
+    team_id: uuid.UUID
+    email: str
+    token: str
+    role: str
+    invited_by: uuid.UUID
+    expires_at: datetime
+    accepted_at: datetime | None
+    revoked_at: datetime | None
+    created_at: datetime
+
+
+class TeamInvitationCreated(SQLModel):
+    invitation: TeamInvitationPublic
+    email_sent: str
+
+
+class TeamInvitationAccepted(SQLModel):
+    member: TeamMemberPublic
+    message: str
+
+
 # ============================================================================
 # EMAIL TEMPLATE MODELS
 # ============================================================================
@@ -1273,9 +1347,20 @@ class UserAPIKey(UserAPIKeyBase, table=True):
     """User API keys for external services."""
 
     __tablename__ = "user_api_key"
+    __table_args__ = (
+        # One key per user/service/credential type; also serves key lookups
+        Index(
+            "ix_userapikey_user_svc_cred",
+            "user_id",
+            "service_name",
+            "credential_type",
+            unique=True,
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    user_id: uuid.UUID = Field(foreign_key="user.id", index=True)
+    # Lookups by user_id use the leading column of ix_userapikey_user_svc_cred
+    user_id: uuid.UUID = Field(foreign_key="user.id")
 
     # Encrypted key storage (stored in Infisical, reference stored here)
     # Format: "infisical://users/{user_id}/api-keys/{service_name}/{credential_type}"
@@ -1284,6 +1369,9 @@ class UserAPIKey(UserAPIKeyBase, table=True):
     # Hash for verification (SHA256)
     key_hash: str = Field(max_length=64)
 
+    # Display mask computed at write time so listing never has to hit Infisical
+    masked_key: str | None = Field(default=None, max_length=50)
+
     # Timestamps
     created_at: datetime = Field(
         default_factory=datetime.utcnow, sa_column=Column(DateTime(timezone=True))
@@ -49,6 +49,9 @@ class PostHogClient:
             self.client = Posthog(
                 project_api_key=settings.POSTHOG_KEY,
                 host="https://app.posthog.com",  # or custom host
+                # Queue events for the background consumer thread instead of
+                # sending an HTTP request per call
+                sync_mode=False,
             )
             logger.info("✅ PostHog client initialized")
         except Exception as e:
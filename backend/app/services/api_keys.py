@@ -7,14 +7,44 @@ Uses Infisical for encrypted storage.
 
 import hashlib
 import logging
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any
 
+import httpx
 from sqlmodel import Session, select
 
 from app.services.secrets import SecretsService, default_secrets_service
 
 logger = logging.getLogger(__name__)
 
+# Decrypted credentials are cached briefly in-process (never in Redis) so bursts
+# like list -> test -> update cost one Infisical round-trip instead of several
+CREDENTIALS_CACHE_TTL_SECONDS = 60
+CREDENTIALS_CACHE_MAX_SIZE = 10_000
+# Concurrent Infisical lookups when retrieving several keys at once. The pool
+# is shared by all requests, so its size also caps the load put on Infisical
+BULK_RETRIEVE_MAX_WORKERS = 8
+bulk_retrieve_executor = ThreadPoolExecutor(
+    max_workers=BULK_RETRIEVE_MAX_WORKERS, thread_name_prefix="api-key-retrieve"
+)
+
+# Validation calls reuse pooled keep-alive connections to each provider instead
+# of paying a new TCP and TLS handshake per create, update and test
+VALIDATION_TIMEOUT_SECONDS = 10.0
+VALIDATION_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# Services whose keys are accepted without a test API call (OAuth flows,
+# deployment-specific endpoints, request signing), so validating them never
+# needs the key itself
+KEYLESS_VALIDATION_SERVICES = frozenset(
+    {"twitter", "reddit", "linkedin", "chromadb", "weaviate", "aws-s3", "azure-blob"}
+)
+
 # Service definitions with validation endpoints
 # Only includes services that are actually integrated and used in the platform
 SERVICE_DEFINITIONS = {
@@ -123,6 +153,13 @@ SERVICE_DEFINITIONS = {
     },
 }
 
+# Accepted credential types per service as sets, for membership checks on the
+# write path; SERVICE_DEFINITIONS keeps the ordered lists (first is default)
+SERVICE_CREDENTIAL_TYPES = {
+    service_name: frozenset(service_def["credential_types"])
+    for service_name, service_def in SERVICE_DEFINITIONS.items()
+}
+
 
 class APIKeyServiceError(Exception):
     """Base exception for API key service errors."""
@@ -150,11 +187,80 @@ class APIKeyService:
     def __init__(self, secrets_service: SecretsService | None = None):
         """Initialize API key service."""
         self.secrets_service = secrets_service or default_secrets_service
+        self._credentials_cache: OrderedDict[
+            tuple[str, str, str | None], tuple[float, dict[str, str]]
+        ] = OrderedDict()
+        self._credentials_cache_lock = threading.Lock()
+        self._http_client: httpx.Client | None = None
+        self._http_client_lock = threading.Lock()
+
+    @staticmethod
+    def _validation_client_options() -> dict[str, Any]:
+        # The client is shared by every user, so never keep cookies a
+        # provider sets in response to someone else's key
+        return {
+            "timeout": VALIDATION_TIMEOUT_SECONDS,
+            "limits": VALIDATION_HTTP_LIMITS,
+            "cookies": CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        }
+
+    def _get_http_client(self) -> httpx.Client:
+        """Get the pooled client for validation calls."""
+        if self._http_client is None:
+            with self._http_client_lock:
+                if self._http_client is None:
+                    self._http_client = httpx.Client(
+                        **self._validation_client_options()
+                    )
+        return self._http_client
+
+    def _get_cached_credentials(
+        self, cache_key: tuple[str, str, str | None]
+    ) -> dict[str, str] | None:
+        with self._credentials_cache_lock:
+            entry = self._credentials_cache.get(cache_key)
+            if entry is None:
+                return None
+            expires_at, credentials = entry
+            if time.monotonic() >= expires_at:
+                del self._credentials_cache[cache_key]
+                return None
+            self._credentials_cache.move_to_end(cache_key)
+            return dict(credentials)
+
+    def _set_cached_credentials(
+        self, cache_key: tuple[str, str, str | None], credentials: dict[str, str]
+    ) -> None:
+        with self._credentials_cache_lock:
+            self._credentials_cache[cache_key] = (
+                time.monotonic() + CREDENTIALS_CACHE_TTL_SECONDS,
+                dict(credentials),
+            )
+            self._credentials_cache.move_to_end(cache_key)
+            while len(self._credentials_cache) > CREDENTIALS_CACHE_MAX_SIZE:
+                self._credentials_cache.popitem(last=False)
+
+    def invalidate_cached_api_key(
+        self, user_id: str, service_name: str, credential_type: str | None = None
+    ) -> None:
+        """
+        Drop cached credentials for a user/service/credential type.
+
+        Args:
+            user_id: User ID
+            service_name: Service name
+            credential_type: Credential type
+        """
+        with self._credentials_cache_lock:
+            self._credentials_cache.pop((user_id, service_name, credential_type), None)
 
     def hash_key(self, key: str) -> str:
         """
         Generate SHA256 hash of API key for verification.
 
+        Uses hashlib's OpenSSL-backed SHA-256, which already uses the CPU's
+        SHA extensions where available.
+
         Args:
             key: API key string
 
@@ -238,6 +344,11 @@ class APIKeyService:
             environment="prod",
             path=path,
         )
+        # Write through, so reading the key back right after saving it (e.g.
+        # testing a key just created or updated) skips Infisical
+        self._set_cached_credentials(
+            (user_id, service_name, credential_type), credentials_data
+        )
 
         logger.info(f"Stored API key for user {user_id}, service {service_name}")
         return path
@@ -260,14 +371,21 @@ class APIKeyService:
             Dictionary with credentials (e.g., {"api_key": "...", "api_secret": "..."})
             or None if not found
         """
+        cache_key = (user_id, service_name, credential_type)
+        cached = self._get_cached_credentials(cache_key)
+        if cached is not None:
+            return cached
+
         path = self.get_infisical_path(user_id, service_name, credential_type)
         secret_key = f"user_{user_id}_{service_name}_{credential_type or 'api_key'}"
 
         try:
+            # Bypass the secrets service's unbounded cache; ours has a TTL
             credentials_json = self.secrets_service.get_secret(
                 secret_key=secret_key,
                 environment="prod",
                 path=path,
+                use_cache=False,
             )
 
             if not credentials_json:
@@ -275,11 +393,41 @@ class APIKeyService:
 
             import json
 
-            return json.loads(credentials_json)
+            credentials = json.loads(credentials_json)
+            self._set_cached_credentials(cache_key, credentials)
+            return credentials
         except Exception as e:
             logger.error(f"Failed to retrieve API key: {e}")
             return None
 
+    def retrieve_api_keys_bulk(
+        self,
+        user_id: str,
+        keys: list[tuple[str, str | None]],
+    ) -> dict[tuple[str, str | None], dict[str, str] | None]:
+        """
+        Retrieve several API keys for a user concurrently.
+
+        Each key lives at its own Infisical path, so the lookups are fanned
+        out over the shared bulk_retrieve_executor instead of run in turn;
+        cached keys return without a round-trip.
+
+        Args:
+            user_id: User ID
+            keys: (service_name, credential_type) pairs
+
+        Returns:
+            Dictionary of (service_name, credential_type) -> credentials or None
+        """
+        keys = list(dict.fromkeys(keys))
+        if len(keys) <= 1:
+            return {key: self.retrieve_api_key(user_id, *key) for key in keys}
+
+        results = bulk_retrieve_executor.map(
+            lambda key: self.retrieve_api_key(user_id, *key), keys
+        )
+        return dict(zip(keys, results, strict=True))
+
     def delete_api_key(
         self,
         user_id: str,
@@ -296,6 +444,7 @@ class APIKeyService:
         """
         path = self.get_infisical_path(user_id, service_name, credential_type)
         secret_key = f"user_{user_id}_{service_name}_{credential_type or 'api_key'}"
+        self.invalidate_cached_api_key(user_id, service_name, credential_type)
 
         try:
             self.secrets_service.delete_secret(
@@ -307,6 +456,56 @@ class APIKeyService:
         except Exception as e:
             logger.error(f"Failed to delete API key: {e}")
 
+    def _validation_request(
+        self, service_name: str, api_key: str, credential_type: str | None = None
+    ) -> tuple[str, str, dict[str, str]] | bool:
+        """
+        Build the test API call used to validate a key.
+
+        Returns:
+            (method, url, headers) for the call, or a final True/False for
+            unknown services and services that can't be checked this way
+        """
+        if service_name not in SERVICE_DEFINITIONS:
+            logger.warning(f"Unknown service: {service_name}")
+            return False
+
+        if service_name in KEYLESS_VALIDATION_SERVICES:
+            return True
+
+        service_def = SERVICE_DEFINITIONS[service_name]
+        headers = {}
+
+        # Set authentication header based on service
+        if service_name == "openai":
+            headers["Authorization"] = f"Bearer {api_key}"
+        elif service_name == "anthropic":
+            headers["x-api-key"] = api_key
+            headers["anthropic-version"] = "2023-06-01"
+        elif service_name in ["google-ai", "google-vision"]:
+            # Google services use query parameter
+            pass
+        elif service_name in [
+            "cohere",
+            "huggingface",
+            "replicate",
+            "e2b",
+            "langsmith",
+        ]:
+            headers["Authorization"] = f"Bearer {api_key}"
+
+        url = service_def["validation_endpoint"]
+        method = service_def.get("validation_method", "GET")
+
+        # Add API key as query parameter for Google services
+        if service_name in ["google-ai", "google-vision"]:
+            if "?" in url:
+                url += f"&key={api_key}"
+            else:
+                url += f"?key={api_key}"
+
+        return method, url, headers
+
     def validate_api_key(
         self, service_name: str, api_key: str, credential_type: str | None = None
     ) -> bool:
@@ -321,73 +520,17 @@ class APIKeyService:
         Returns:
             True if valid, False otherwise
         """
-        if service_name not in SERVICE_DEFINITIONS:
-            logger.warning(f"Unknown service: {service_name}")
-            return False
-
-        service_def = SERVICE_DEFINITIONS[service_name]
+        request = self._validation_request(service_name, api_key, credential_type)
+        if isinstance(request, bool):
+            return request
+        method, url, headers = request
 
         try:
-            import httpx
-
-            headers = {}
-
-            # Set authentication header based on service
-            if service_name == "openai":
-                headers["Authorization"] = f"Bearer {api_key}"
-            elif service_name == "anthropic":
-                headers["x-api-key"] = api_key
-                headers["anthropic-version"] = "2023-06-01"
-            elif service_name in ["google-ai", "google-vision"]:
-                # Google services use query parameter
-                pass
-            elif service_name in [
-                "cohere",
-                "huggingface",
-                "replicate",
-                "e2b",
-                "langsmith",
-            ]:
-                headers["Authorization"] = f"Bearer {api_key}"
-            elif service_name == "twitter":
-                if credential_type == "bearer_token":
-                    headers["Authorization"] = f"Bearer {api_key}"
-                # For OAuth, validation is more complex
-                return True  # Skip validation for OAuth
-            elif service_name in ["reddit", "linkedin"]:
-                # OAuth services - skip validation
-                return True
-            elif service_name in ["chromadb", "weaviate"]:
-                # Services with variable validation endpoints - skip validation
-                return True
-            elif service_name == "aws-s3":
-                # AWS services require signature - skip validation
-                return True
-            elif service_name == "azure-blob":
-                # Azure services require specific headers - skip validation
-                return True
-
-            # Make validation request
-            url = service_def["validation_endpoint"]
-            method = service_def.get("validation_method", "GET")
-
-            # Add API key as query parameter for Google services
-            if service_name in ["google-ai", "google-vision"]:
-                if "?" in url:
-                    url += f"&key={api_key}"
-                else:
-                    url += f"?key={api_key}"
-
-            with httpx.Client(timeout=10.0) as client:
-                if method == "GET":
-                    response = client.get(url, headers=headers)
-                else:
-                    # For POST, send minimal payload
-                    response = client.post(
-                        url, headers=headers, json={} if method == "POST" else None
-                    )
-
-                return response.status_code in [200, 201, 204]
+            # For POST, send minimal payload
+            response = self._get_http_client().request(
+                method, url, headers=headers, json={} if method == "POST" else None
+            )
+            return response.status_code in [200, 201, 204]
 
         except Exception as e:
             logger.error(f"API key validation failed: {e}")
@@ -55,6 +55,8 @@ class StorageService:
 
     def __init__(self):
         """Initialize Supabase Storage client."""
+        # Buckets already confirmed to exist, so uploads skip the check
+        self._verified_buckets: set[str] = set()
         if not settings.SUPABASE_URL or not settings.SUPABASE_ANON_KEY:
             logger.warning(
                 "Supabase Storage not configured. SUPABASE_URL and SUPABASE_ANON_KEY required."
@@ -120,7 +122,7 @@ class StorageService:
                 file_bytes = file_data
 
             # Upload file
-            upload_response = self.client.storage.from_(bucket).upload(
+            self.client.storage.from_(bucket).upload(
                 path=file_path,
                 file=file_bytes,
                 file_options={
@@ -130,9 +132,6 @@ class StorageService:
                 },
             )
 
-            # Get file info
-            file_info = self.client.storage.from_(bucket).list(path=file_path)
-
             # Generate public URL if bucket is public
             public_url = None
             try:
@@ -397,9 +396,13 @@ class StorageService:
         if not self.is_available or not self.client:
             return
 
+        if bucket in self._verified_buckets:
+            return
+
         try:
             # Try to list files in bucket (this will fail if bucket doesn't exist)
-            self.client.storage.from_(bucket).list(limit=1)
+            self.client.storage.from_(bucket).list(options={"limit": 1})
+            self._verified_buckets.add(bucket)
         except Exception:
             # Bucket doesn't exist, try to create it
             try:
@@ -10,10 +10,13 @@ from datetime import datetime, timedelta, timezone
 
 from pydantic import EmailStr
 from sqlmodel import Session, select
+from tenacity import retry, retry_if_result, stop_after_attempt, wait_exponential
 
 from app.core.config import settings
+from app.core.db import engine
 from app.models import Team, TeamInvitation, TeamMember, User
 from app.services.email_service import email_service
+from app.services.email_template_service import get_email_template_service
 
 logger = logging.getLogger(__name__)
 
@@ -235,6 +238,42 @@ class TeamService:
         logger.info(f"Invitation created for {email} to team {team_id}")
         return invitation
 
+    def render_invitation_email(
+        self,
+        *,
+        invitation: TeamInvitation,
+        team: Team,
+        inviter_name: str | None = None,
+    ) -> tuple[str, str]:
+        """Render the subject and HTML content of an invitation email"""
+        template_service = get_email_template_service(self.session)
+        template = template_service.get_template_by_slug("team-invitation")
+        if not template:
+            # Fallback to default template
+            subject = f"Invitation to join {team.name} on {settings.PROJECT_NAME}"
+            html_content = self._generate_default_invitation_email(
+                invitation=invitation, team=team, inviter_name=inviter_name
+            )
+            return subject, html_content
+
+        # Render template
+        accept_url = f"{settings.FRONTEND_HOST}/teams/invitations/accept?token={invitation.token}"
+        context = {
+            "team_name": team.name,
+            "inviter_name": inviter_name or "Team Owner",
+            "accept_url": accept_url,
+            "expires_at": invitation.expires_at.isoformat(),
+            "role": invitation.role,
+            "project_name": settings.PROJECT_NAME,
+        }
+        subject = template_service.render_template(
+            template=template, field="subject", context=context
+        )
+        html_content = template_service.render_template(
+            template=template, field="html_content", context=context
+        )
+        return subject, html_content
+
     def send_invitation_email(
         self,
         *,
@@ -244,34 +283,9 @@ class TeamService:
     ) -> bool:
         """Send invitation email via Resend"""
         try:
-            from app.services.email_template_service import email_template_service
-
-            # Get invitation email template
-            template = email_template_service.get_template_by_slug("team-invitation")
-            if not template:
-                # Fallback to default template
-                subject = f"Invitation to join {team.name} on {settings.PROJECT_NAME}"
-                html_content = self._generate_default_invitation_email(
-                    invitation=invitation, team=team, inviter_name=inviter_name
-                )
-            else:
-                # Render template
-                accept_url = f"{settings.FRONTEND_HOST}/teams/invitations/accept?token={invitation.token}"
-                context = {
-                    "team_name": team.name,
-                    "inviter_name": inviter_name or "Team Owner",
-                    "accept_url": accept_url,
-                    "expires_at": invitation.expires_at.isoformat(),
-                    "role": invitation.role,
-                    "project_name": settings.PROJECT_NAME,
-                }
-                subject = template_service.render_template(
-                    template=template, field="subject", context=context
-                )
-                html_content = template_service.render_template(
-                    template=template, field="html_content", context=context
-                )
-
+            subject, html_content = self.render_invitation_email(
+                invitation=invitation, team=team, inviter_name=inviter_name
+            )
             return email_service.send_email(
                 email_to=invitation.email,
                 subject=subject,
@@ -327,6 +341,11 @@ class TeamService:
         if not user or user.email != invitation.email:
             raise ValueError("User email does not match invitation email")
 
+        # Mark invitation as accepted; add_member commits it together with the
+        # membership, so the returned member is not expired by a second commit
+        invitation.accepted_at = datetime.now(timezone.utc)
+        self.session.add(invitation)
+
         # Add user to team
         member = self.add_member(
             team_id=invitation.team_id,
@@ -335,10 +354,9 @@ class TeamService:
             invited_by=invitation.invited_by,
         )
 
-        # Mark invitation as accepted
-        invitation.accepted_at = datetime.now(timezone.utc)
-        self.session.add(invitation)
-        self.session.commit()
+        if self.session.dirty:
+            # add_member found an unchanged membership and did not commit
+            self.session.commit()
 
         logger.info(f"Invitation {invitation.id} accepted by user {user_id}")
         return member
@@ -377,3 +395,74 @@ class TeamService:
         """List all team members"""
         query = select(TeamMember).where(TeamMember.team_id == team_id)
         return list(self.session.exec(query.order_by(TeamMember.joined_at)).all())
+
+
+@retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=1, max=30),
+    retry=retry_if_result(lambda sent: not sent),
+    retry_error_callback=lambda retry_state: False,
+)
+def _send_invitation_email_retrying(
+    email_to: str, subject: str, html_content: str
+) -> bool:
+    return email_service.send_email(
+        email_to=email_to, subject=subject, html_content=html_content
+    )
+
+
+def send_invitation_email_task(
+    invitation_id: uuid.UUID,
+    team_id: uuid.UUID,
+    inviter_name: str | None = None,
+) -> bool:
+    """
+    Send a team invitation email as a background task.
+
+    Re-loads the invitation and team in a fresh session, since the request
+    session is closed by the time this runs, and renders the email before
+    closing it again: the session would otherwise hold a pooled connection
+    through every retry. Delivery is retried with exponential backoff;
+    permanent failures are recorded as a system alert.
+    """
+    with Session(engine) as session:
+        invitation = session.get(TeamInvitation, invitation_id)
+        team = session.get(Team, team_id)
+        if not invitation or not team:
+            logger.warning(
+                f"Skipping invitation email: invitation {invitation_id} "
+                f"or team {team_id} no longer exists"
+            )
+            return False
+
+        email_to = invitation.email
+        try:
+            subject, html_content = TeamService(session).render_invitation_email(
+                invitation=invitation, team=team, inviter_name=inviter_name
+            )
+        except Exception as e:
+            logger.error(f"Failed to render invitation email: {e}", exc_info=True)
+            return False
+
+    if _send_invitation_email_retrying(email_to, subject, html_content):
+        return True
+
+    logger.error(f"Failed to send invitation email to {email_to}")
+    try:
+        from app.services.system_alerts import create_system_alert
+
+        with Session(engine) as session:
+            create_system_alert(
+                session,
+                alert_type="email_delivery_failed",
+                severity="warning",
+                title="Team invitation email failed",
+                message=f"Could not deliver invitation email to {email_to} after retries",
+                details={
+                    "invitation_id": str(invitation_id),
+                    "team_id": str(team_id),
+                },
+            )
+    except Exception as e:
+        logger.warning(f"Failed to record email delivery alert: {e}")
+    return False
@@ -0,0 +1,294 @@
+"""
+User Data Export Service
+
+Builds the user data export ZIP and runs it as a background job whose status
+is polled by the client.
+
+Job status is kept in the cache service. With more than one worker process it
+needs Redis (REDIS_URL): without it each worker only sees the jobs it started
+itself, so a status poll routed to another worker gets a 404 for a job that
+exists.
+"""
+
+import logging
+import tempfile
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import IO, Any
+
+import orjson
+from sqlalchemy import literal
+from sqlalchemy.orm import joinedload
+from sqlmodel import Session, select
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from app.cache import default_cache_service
+from app.core.db import engine
+from app.models import TeamMember, User, UserAPIKey, Workflow, WorkflowExecution
+from app.services.storage import default_storage_service
+
+logger = logging.getLogger(__name__)
+
+# Exports larger than this are spooled to a temporary file instead of memory
+EXPORT_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+# Concurrent export queries; each holds its own pooled connection on top of the
+# job's session, so keep this well below the engine's pool size
+EXPORT_QUERY_WORKERS = 2
+# Rows fetched per server-side cursor batch when streaming large sections
+EXPORT_YIELD_PER = 500
+# How long job status (and the download link it points to) is kept
+EXPORT_JOB_TTL_SECONDS = 24 * 60 * 60
+
+
+def _export_rows(statement: Any) -> list[dict[str, Any]]:
+    # Column-only selects skip ORM instance construction entirely
+    with Session(engine) as session:
+        return [row._asdict() for row in session.exec(statement)]
+
+
+def _write_json_array(
+    zipf: zipfile.ZipFile, name: str, session: Session, statement: Any
+) -> None:
+    """
+    Stream query rows into a JSON array file inside the ZIP.
+
+    Rows are read through a server-side cursor and written one at a time, so
+    memory stays bounded by EXPORT_YIELD_PER regardless of how many rows exist.
+    """
+    rows = session.exec(statement.execution_options(yield_per=EXPORT_YIELD_PER))
+    with zipf.open(name, "w", force_zip64=True) as f:
+        f.write(b"[")
+        for index, row in enumerate(rows):
+            f.write(b"\n" if index == 0 else b",\n")
+            f.write(
+                orjson.dumps(row._asdict(), default=str, option=orjson.OPT_NAIVE_UTC)
+            )
+        f.write(b"\n]\n")
+
+
+def _workflows_statement(user_id: uuid.UUID) -> Any:
+    return select(
+        Workflow.id,
+        Workflow.name,
+        Workflow.description,
+        Workflow.is_active,
+        Workflow.trigger_config,
+        Workflow.graph_config,
+        Workflow.created_at,
+        Workflow.updated_at,
+    ).where(Workflow.owner_id == user_id)
+
+
+def _workflow_executions_statement(user_id: uuid.UUID) -> Any:
+    return (
+        select(
+            WorkflowExecution.execution_id,
+            WorkflowExecution.workflow_id,
+            WorkflowExecution.status,
+            WorkflowExecution.started_at,
+            WorkflowExecution.completed_at,
+        )
+        .join(Workflow, Workflow.id == WorkflowExecution.workflow_id)
+        .where(Workflow.owner_id == user_id)
+        .order_by(WorkflowExecution.started_at.desc())
+    )
+
+
+def _export_api_keys(user_id: uuid.UUID) -> list[dict[str, Any]]:
+    return _export_rows(
+        select(
+            UserAPIKey.service_name,
+            UserAPIKey.service_display_name,
+            UserAPIKey.credential_type,
+            literal("***hidden***").label("masked_key"),
+            UserAPIKey.is_active,
+            UserAPIKey.created_at,
+        ).where(UserAPIKey.user_id == user_id)
+    )
+
+
+def _export_team_memberships(user_id: uuid.UUID) -> list[dict[str, Any]]:
+    return _export_rows(
+        select(TeamMember.team_id, TeamMember.role, TeamMember.joined_at).where(
+            TeamMember.user_id == user_id
+        )
+    )
+
+
+def build_user_data_export(session: Session, user: User) -> IO[bytes]:
+    """
+    Build the export ZIP for a user.
+
+    Returns a spooled file positioned at the start of the ZIP; the caller is
+    responsible for closing it.
+    """
+    export_data = {
+        "export_date": datetime.utcnow().isoformat(),
+        "user_id": str(user.id),
+        "user_email": user.email,
+        "user_profile": {
+            "email": user.email,
+            "full_name": user.full_name,
+            "is_active": user.is_active,
+            "is_superuser": user.is_superuser,
+        },
+    }
+    preferences = user.preferences
+    if preferences:
+        export_data["preferences"] = {
+            "theme": preferences.theme,
+            "timezone": preferences.timezone,
+            "language": preferences.language,
+        }
+
+    # Build the ZIP in memory, spilling to disk only for very large exports
+    zip_buffer = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+    with (
+        ThreadPoolExecutor(max_workers=EXPORT_QUERY_WORKERS) as executor,
+        zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zipf,
+    ):
+        # Small sections load on their own sessions while the large ones
+        # stream into the ZIP below
+        loaders = {
+            "api_keys": _export_api_keys,
+            "team_memberships": _export_team_memberships,
+        }
+        futures = {
+            key: executor.submit(loader, user.id) for key, loader in loaders.items()
+        }
+
+        # Workflows and executions can be large, so each gets its own file
+        _write_json_array(
+            zipf, "workflows.json", session, _workflows_statement(user.id)
+        )
+        _write_json_array(
+            zipf,
+            "workflow_executions.json",
+            session,
+            _workflow_executions_statement(user.id),
+        )
+
+        for key, future in futures.items():
+            export_data[key] = future.result()
+
+        # Add main data file; orjson serializes datetimes and UUIDs natively
+        zipf.writestr(
+            "user_data.json",
+            orjson.dumps(
+                export_data,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC,
+            ),
+        )
+
+        # Add README
+        readme = f"""User Data Export
+Generated: {datetime.utcnow().isoformat()}
+User ID: {user.id}
+Email: {user.email}
+
+This export contains:
+- user_data.json: profile, API keys (masked for security), team memberships
+  and preferences
+- workflows.json: workflows; upload this file in Data Import to restore them
+- workflow_executions.json: workflow executions
+
+All timestamps are in UTC.
+"""
+        zipf.writestr("README.txt", readme)
+
+    zip_buffer.seek(0)
+    return zip_buffer
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    reraise=True,
+)
+def _upload_export(file_name: str, zip_buffer: IO[bytes]) -> dict[str, Any]:
+    # Rewind on every attempt so a retry re-sends the whole file
+    zip_buffer.seek(0)
+    return default_storage_service.upload_file(
+        bucket="exports",
+        file_path=file_name,
+        file_data=zip_buffer,
+        content_type="application/zip",
+    )
+
+
+def _export_job_key(job_id: str) -> str:
+    return f"user-data-export:{job_id}"
+
+
+def get_export_job(job_id: str) -> dict[str, Any] | None:
+    """
+    Get the status record of an export job, or None if unknown/expired.
+
+    Without Redis only jobs started by this worker process are found.
+    """
+    return default_cache_service.get(_export_job_key(job_id))
+
+
+def _set_export_job(job: dict[str, Any]) -> None:
+    default_cache_service.set(
+        _export_job_key(job["job_id"]), job, ttl_seconds=EXPORT_JOB_TTL_SECONDS
+    )
+
+
+def create_export_job(user_id: uuid.UUID) -> dict[str, Any]:
+    """Record a new pending export job for a user."""
+    job = {
+        "job_id": str(uuid.uuid4()),
+        "user_id": str(user_id),
+        "status": "pending",
+        "download_url": None,
+        "expires_at": None,
+        "error": None,
+    }
+    _set_export_job(job)
+    return job
+
+
+def run_user_data_export_job(job_id: str, user_id: uuid.UUID) -> None:
+    """
+    Build and upload a user's data export as a background task.
+
+    Uses a fresh session, since the request session is closed by the time
+    this runs. Progress and the resulting download URL are stored on the job
+    record for the client to poll.
+    """
+    job = get_export_job(job_id) or {"job_id": job_id, "user_id": str(user_id)}
+    job["status"] = "running"
+    _set_export_job(job)
+
+    try:
+        with Session(engine) as session:
+            user = session.exec(
+                select(User)
+                .options(joinedload(User.preferences))
+                .where(User.id == user_id)
+            ).first()
+            if not user:
+                raise ValueError(f"User {user_id} no longer exists")
+
+            zip_buffer = build_user_data_export(session, user)
+
+        with zip_buffer:
+            file_name = f"exports/user_{user_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
+            upload_result = _upload_export(file_name, zip_buffer)
+
+        job.update(
+            status="completed",
+            download_url=upload_result.get("url")
+            or upload_result.get("signed_url")
+            or upload_result.get("public_url"),
+            expires_at=(datetime.utcnow() + timedelta(days=7)).isoformat(),
+        )
+    except Exception as e:
+        logger.error(f"Failed to create export for user {user_id}: {e}")
+        job.update(status="failed", error=str(e))
+
+    _set_export_job(job)
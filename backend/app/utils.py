@@ -8,6 +8,7 @@ import emails  # type: ignore
 import jwt
 from jinja2 import Template
 from jwt.exceptions import InvalidTokenError
+from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core import security
 from app.core.config import settings
@@ -55,6 +56,37 @@ def send_email(
     logger.info(f"send email result: {response}")
 
 
+@retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=1, max=30),
+    reraise=True,
+)
+def _send_email_retrying(*, email_to: str, subject: str, html_content: str) -> None:
+    send_email(email_to=email_to, subject=subject, html_content=html_content)
+
+
+def send_email_with_retry(
+    *,
+    email_to: str,
+    subject: str = "",
+    html_content: str = "",
+) -> bool:
+    """
+    Send an email with exponential backoff, for use as a background task.
+
+    Returns False instead of raising once all retries are exhausted, so a
+    failed delivery never surfaces in the request that queued it.
+    """
+    try:
+        _send_email_retrying(
+            email_to=email_to, subject=subject, html_content=html_content
+        )
+    except Exception as e:
+        logger.error(f"Giving up on email to {email_to} after retries: {e}")
+        return False
+    return True
+
+
 def generate_test_email(email_to: str) -> EmailData:
     project_name = settings.PROJECT_NAME
     subject = f"{project_name} - Test email"
@@ -13,9 +13,59 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Any
 
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select, text
 
-from app.models import WorkflowExecution
+from app.models import Workflow, WorkflowExecution
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def _stats_columns() -> tuple[Any, ...]:
+    """Aggregate columns for execution statistics, computed in the database."""
+    completed = WorkflowExecution.status == "completed"
+    return (
+        func.count().label("total_executions"),
+        func.count().filter(completed).label("completed"),
+        func.count().filter(WorkflowExecution.status == "failed").label("failed"),
+        func.count().filter(WorkflowExecution.status == "running").label("running"),
+        func.avg(
+            func.extract(
+                "epoch", WorkflowExecution.completed_at - WorkflowExecution.started_at
+            )
+        )
+        .filter(completed, WorkflowExecution.completed_at.is_not(None))
+        .label("avg_duration_seconds"),
+    )
+
+
+def _filter_scope(
+    query: Any, workflow_id: uuid.UUID | None, owner_id: uuid.UUID | None
+) -> Any:
+    """Restrict an executions query to one workflow and/or one owner's workflows."""
+    if workflow_id:
+        query = query.where(WorkflowExecution.workflow_id == workflow_id)
+    if owner_id:
+        query = query.join(
+            Workflow, Workflow.id == WorkflowExecution.workflow_id
+        ).where(Workflow.owner_id == owner_id)
+    return query
+
+
+def _stats_from_row(row: Any) -> dict[str, Any]:
+    """Build the statistics dictionary from a row of _stats_columns()."""
+    total_executions = row.total_executions if row else 0
+    completed = row.completed if row else 0
+    failed = row.failed if row else 0
+    avg_duration = row.avg_duration_seconds if row else None
+    return {
+        "total_executions": total_executions,
+        "completed": completed,
+        "failed": failed,
+        "running": row.running if row else 0,
+        "success_rate": (completed / total_executions if total_executions > 0 else 0),
+        "failure_rate": (failed / total_executions if total_executions > 0 else 0),
+        "avg_duration_seconds": float(avg_duration) if avg_duration is not None else 0,
+    }
 
 
 class WorkflowAnalytics:
@@ -33,6 +83,7 @@ class WorkflowAnalytics:
         workflow_id: uuid.UUID | None = None,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        owner_id: uuid.UUID | None = None,
     ) -> dict[str, Any]:
         """
         Get execution statistics.
@@ -42,14 +93,12 @@ class WorkflowAnalytics:
             workflow_id: Optional workflow ID filter
             start_date: Optional start date filter
             end_date: Optional end date filter
+            owner_id: Optional filter by the owner of the workflows
 
         Returns:
             Statistics dictionary
         """
-        query = select(WorkflowExecution)
-
-        if workflow_id:
-            query = query.where(WorkflowExecution.workflow_id == workflow_id)
+        query = _filter_scope(select(*_stats_columns()), workflow_id, owner_id)
 
         if start_date:
             query = query.where(WorkflowExecution.started_at >= start_date)
@@ -57,42 +106,14 @@ class WorkflowAnalytics:
         if end_date:
             query = query.where(WorkflowExecution.started_at <= end_date)
 
-        executions = list(session.exec(query).all())
-
-        total_executions = len(executions)
-        completed = sum(1 for e in executions if e.status == "completed")
-        failed = sum(1 for e in executions if e.status == "failed")
-        running = sum(1 for e in executions if e.status == "running")
-
-        # Calculate average duration
-        completed_executions = [
-            e for e in executions if e.status == "completed" and e.completed_at
-        ]
-        avg_duration_seconds = 0
-        if completed_executions:
-            durations = [
-                (e.completed_at - e.started_at).total_seconds()
-                for e in completed_executions
-            ]
-            avg_duration_seconds = sum(durations) / len(durations)
-
-        return {
-            "total_executions": total_executions,
-            "completed": completed,
-            "failed": failed,
-            "running": running,
-            "success_rate": (
-                completed / total_executions if total_executions > 0 else 0
-            ),
-            "failure_rate": (failed / total_executions if total_executions > 0 else 0),
-            "avg_duration_seconds": avg_duration_seconds,
-        }
+        return _stats_from_row(session.exec(query).one())
 
     def get_performance_metrics(
         self,
         session: Session,
         workflow_id: uuid.UUID | None = None,
         days: int = 7,
+        owner_id: uuid.UUID | None = None,
     ) -> dict[str, Any]:
         """
         Get performance metrics.
@@ -101,6 +122,7 @@ class WorkflowAnalytics:
             session: Database session
             workflow_id: Optional workflow ID filter
             days: Number of days to analyze
+            owner_id: Optional filter by the owner of the workflows
 
         Returns:
             Performance metrics dictionary
@@ -108,7 +130,9 @@ class WorkflowAnalytics:
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
 
-        stats = self.get_execution_stats(session, workflow_id, start_date, end_date)
+        stats = self.get_execution_stats(
+            session, workflow_id, start_date, end_date, owner_id
+        )
 
         # Calculate throughput (executions per hour)
         total_executions = stats["total_executions"]
@@ -126,6 +150,9 @@ class WorkflowAnalytics:
         session: Session,
         workflow_id: uuid.UUID | None = None,
         days: int = 30,
+        owner_id: uuid.UUID | None = None,
+        offset: int = 0,
+        limit: int | None = None,
     ) -> list[dict[str, Any]]:
         """
         Get usage trends over time.
@@ -134,17 +161,42 @@ class WorkflowAnalytics:
             session: Database session
             workflow_id: Optional workflow ID filter
             days: Number of days to analyze
+            owner_id: Optional filter by the owner of the workflows
+            offset: Number of days to skip from the start of the series
+            limit: Maximum number of days to return (all if None)
 
         Returns:
-            List of daily statistics
+            List of daily statistics, in chronological order
         """
-        trends = []
+        # Day i of the series is the 24h bucket days - 1 - i back from now;
+        # only the buckets of the requested slice are aggregated
+        oldest = days - 1 - offset
+        newest = max(days - offset - (days if limit is None else limit), 0)
+        if oldest < newest:
+            return []
+
+        # One grouped query over the whole window instead of one per day; each
+        # execution falls in the 24h bucket counted back from now
+        now = datetime.utcnow()
+        day_bucket = func.floor(
+            func.extract("epoch", now - WorkflowExecution.started_at) / SECONDS_PER_DAY
+        ).label("day_bucket")
+        query = (
+            select(day_bucket, *_stats_columns())
+            .where(
+                WorkflowExecution.started_at >= now - timedelta(days=oldest + 1),
+                WorkflowExecution.started_at <= now - timedelta(days=newest),
+            )
+            .group_by(text("day_bucket"))
+        )
+        query = _filter_scope(query, workflow_id, owner_id)
 
-        for day_offset in range(days):
-            day_start = datetime.utcnow() - timedelta(days=day_offset + 1)
-            day_end = datetime.utcnow() - timedelta(days=day_offset)
+        rows = {int(row.day_bucket): row for row in session.exec(query)}
 
-            stats = self.get_execution_stats(session, workflow_id, day_start, day_end)
+        trends = []
+        for day_offset in range(oldest, newest - 1, -1):
+            day_start = now - timedelta(days=day_offset + 1)
+            stats = _stats_from_row(rows.get(day_offset))
 
             trends.append(
                 {
@@ -153,13 +205,14 @@ class WorkflowAnalytics:
                 }
             )
 
-        return list(reversed(trends))  # Return in chronological order
+        return trends
 
     def get_cost_estimate(
         self,
         session: Session,
         workflow_id: uuid.UUID | None = None,
         days: int = 30,
+        owner_id: uuid.UUID | None = None,
     ) -> dict[str, Any]:
         """
         Get cost estimate (simplified - would integrate with actual cost tracking).
@@ -168,6 +221,7 @@ class WorkflowAnalytics:
             session: Database session
             workflow_id: Optional workflow ID filter
             days: Number of days to analyze
+            owner_id: Optional filter by the owner of the workflows
 
         Returns:
             Cost estimate dictionary
@@ -177,6 +231,7 @@ class WorkflowAnalytics:
             workflow_id,
             datetime.utcnow() - timedelta(days=days),
             datetime.utcnow(),
+            owner_id,
         )
 
         # Simplified cost calculation (would use actual resource usage)
@@ -0,0 +1,97 @@
+"""
+Workflow Analytics Cache
+
+Caches analytics results per user and query, so dashboards polling the same
+stats, trends or cost windows are served from the cache instead of
+re-aggregating executions on every request.
+
+Entries are served stale-while-revalidate: past ANALYTICS_REFRESH_AFTER_SECONDS
+the cached result is still returned while one caller recomputes it in the
+background. Like the workflow list cache, entries are keyed under a per-owner
+generation counter, bumped when the user starts or terminates an execution.
+Each bump orphans the owner's entries, so with Redis they are kept there only:
+an orphaned copy in process memory would never be read again.
+"""
+
+import time
+import uuid
+from datetime import datetime
+from typing import Any
+
+from app.cache import default_cache_service
+
+ANALYTICS_CACHE_TTL_SECONDS = 120
+# Entries older than this are refreshed in the background on the next hit
+ANALYTICS_REFRESH_AFTER_SECONDS = 30
+# Requested date windows are rounded to this, so polls with a moving "now"
+# share an entry
+ANALYTICS_WINDOW_BUCKET_SECONDS = 60
+ANALYTICS_GENERATION_TTL_SECONDS = 24 * 60 * 60
+
+
+def _generation_key(owner_id: uuid.UUID) -> str:
+    return f"analytics:{owner_id}:generation"
+
+
+def _bucket(value: datetime | None) -> int | None:
+    if value is None:
+        return None
+    return int(value.timestamp()) // ANALYTICS_WINDOW_BUCKET_SECONDS
+
+
+def analytics_cache_key(
+    name: str,
+    owner_id: uuid.UUID,
+    workflow_id: uuid.UUID | None = None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    days: int | None = None,
+) -> str:
+    """Build the cache key of one analytics query for an owner."""
+    generation = default_cache_service.get(_generation_key(owner_id)) or 0
+    return (
+        f"analytics:{owner_id}:{generation}:{name}:{workflow_id}:"
+        f"{_bucket(start_date)}:{_bucket(end_date)}:{days}"
+    )
+
+
+def get_cached_analytics(key: str) -> tuple[Any, bool] | None:
+    """
+    Get a cached analytics result.
+
+    Returns:
+        (result, needs_refresh), or None if not cached
+    """
+    entry = default_cache_service.get(key)
+    if entry is None:
+        return None
+    age = time.time() - entry["generated_at"]
+    return entry["result"], age >= ANALYTICS_REFRESH_AFTER_SECONDS
+
+
+def cache_analytics(key: str, result: Any) -> None:
+    """Cache an analytics result."""
+    default_cache_service.set(
+        key,
+        {"generated_at": time.time(), "result": result},
+        ttl_seconds=ANALYTICS_CACHE_TTL_SECONDS,
+        local_copy=False,
+    )
+
+
+def claim_analytics_refresh(key: str) -> bool:
+    """Claim the background refresh of a stale entry, so only one caller runs it."""
+    # Without Redis there is no shared lock; each worker refreshes its own cache
+    return (
+        default_cache_service.set_if_absent(
+            f"{key}:refreshing", 1, ttl_seconds=ANALYTICS_REFRESH_AFTER_SECONDS
+        )
+        is not False
+    )
+
+
+def invalidate_analytics_cache(owner_id: uuid.UUID) -> None:
+    """Drop every cached analytics result of an owner."""
+    default_cache_service.incr(
+        _generation_key(owner_id), ttl_seconds=ANALYTICS_GENERATION_TTL_SECONDS
+    )
@@ -53,6 +53,20 @@ class WorkflowDebugger:
         """
         self.breakpoints.add(f"{execution_id}:{node_id}")
 
+    def set_breakpoints(
+        self,
+        execution_id: uuid.UUID,
+        node_ids: list[str],
+    ) -> None:
+        """
+        Set breakpoints at several nodes at once.
+
+        Args:
+            execution_id: Execution ID
+            node_ids: Node IDs
+        """
+        self.breakpoints.update(f"{execution_id}:{node_id}" for node_id in node_ids)
+
     def remove_breakpoint(
         self,
         execution_id: uuid.UUID,
@@ -8,8 +8,11 @@ Manages workflow-to-workflow dependencies:
 """
 
 import uuid
+from collections.abc import Iterable
+from typing import Any
 
-from sqlmodel import Session
+from sqlalchemy import text
+from sqlmodel import Session, select
 
 from app.models import Workflow
 
@@ -20,6 +23,160 @@ class DependencyError(Exception):
     pass
 
 
+# Dependency IDs reachable from a workflow, in one round trip. Elements that
+# are not UUIDs are skipped, like _parse_dependency_ids does, and a non-array
+# "dependencies" value counts as empty. UNION drops repeats, so cycles end.
+_TRANSITIVE_DEPENDENCIES_SQL = text(
+    """
+    WITH RECURSIVE deps(id) AS (
+        SELECT dep.id
+        FROM workflow
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE
+                WHEN jsonb_typeof(CAST(workflow.graph_config AS jsonb) -> 'dependencies') = 'array'
+                THEN CAST(workflow.graph_config AS jsonb) -> 'dependencies'
+                ELSE '[]'::jsonb
+            END
+        ) AS dep(id)
+        WHERE workflow.id = :workflow_id AND dep.id ~* :uuid_pattern
+        UNION
+        SELECT dep.id
+        FROM deps
+        JOIN workflow ON workflow.id = CAST(deps.id AS uuid)
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE
+                WHEN jsonb_typeof(CAST(workflow.graph_config AS jsonb) -> 'dependencies') = 'array'
+                THEN CAST(workflow.graph_config AS jsonb) -> 'dependencies'
+                ELSE '[]'::jsonb
+            END
+        ) AS dep(id)
+        WHERE dep.id ~* :uuid_pattern
+    )
+    SELECT CAST(id AS uuid) AS id FROM deps
+    """
+)
+_UUID_PATTERN = "^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+
+
+def _parse_dependency_ids(graph_config: dict[str, Any] | None) -> list[uuid.UUID]:
+    """Read the dependency IDs stored in a workflow's graph_config."""
+    dependency_ids = []
+    for dep_id in (graph_config or {}).get("dependencies", []):
+        try:
+            if isinstance(dep_id, str):
+                dependency_ids.append(uuid.UUID(dep_id))
+            else:
+                dependency_ids.append(dep_id)
+        except ValueError:
+            continue
+    return dependency_ids
+
+
+def _find_cycle(
+    graph: dict[uuid.UUID, list[uuid.UUID]], start: uuid.UUID
+) -> list[uuid.UUID] | None:
+    """
+    Find a cycle reachable from start in a dependency graph.
+
+    Iterative depth-first search with white/gray/black coloring: every node
+    and edge is visited once, and reaching a gray node (one still on the
+    stack) closes a cycle.
+
+    Returns:
+        The cycle as a path that ends where it starts, or None
+    """
+    on_stack: dict[uuid.UUID, int] = {start: 0}  # Gray nodes, by stack depth
+    done: set[uuid.UUID] = set()  # Black nodes
+    stack = [(start, iter(graph.get(start, [])))]
+
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if child in on_stack:
+                path = [entry[0] for entry in stack[on_stack[child] :]]
+                return [*path, child]
+            if child not in done:
+                on_stack[child] = len(stack)
+                stack.append((child, iter(graph.get(child, []))))
+                break
+        else:
+            stack.pop()
+            del on_stack[node]
+            done.add(node)
+
+    return None
+
+
+def _cyclic_components(
+    graph: dict[uuid.UUID, list[uuid.UUID]],
+) -> list[list[uuid.UUID]]:
+    """
+    Find the strongly connected components of a dependency graph that
+    contain a cycle.
+
+    Iterative Tarjan's algorithm, O(V + E). Workflow IDs are mapped to list
+    indexes once up front, so the main loop works on ints instead of hashing
+    UUIDs. Edges to workflows missing from the graph are ignored.
+
+    Returns:
+        Each cyclic component's members, in discovery order
+    """
+    nodes = list(graph)
+    index_of = {node: i for i, node in enumerate(nodes)}
+    adjacency = [
+        [index_of[dep] for dep in graph[node] if dep in index_of] for node in nodes
+    ]
+
+    index = [-1] * len(nodes)
+    lowlink = [0] * len(nodes)
+    on_stack = [False] * len(nodes)
+    stack: list[int] = []
+    counter = 0
+    components = []
+
+    for root in range(len(nodes)):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+
+        while work:
+            node, edge = work[-1]
+            if edge < len(adjacency[node]):
+                work[-1] = (node, edge + 1)
+                child = adjacency[node][edge]
+                if index[child] == -1:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    work.append((child, 0))
+                elif on_stack[child]:
+                    lowlink[node] = min(lowlink[node], index[child])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                # A single workflow is only cyclic if it depends on itself
+                if len(component) > 1 or node in adjacency[node]:
+                    components.append([nodes[member] for member in reversed(component)])
+
+    return components
+
+
 class DependencyManager:
     """
     Manages workflow dependencies.
@@ -48,22 +205,30 @@ class DependencyManager:
         if not workflow:
             return []
 
-        # Get dependencies from graph_config
-        graph_config = workflow.graph_config or {}
-        dependencies = graph_config.get("dependencies", [])
+        return _parse_dependency_ids(workflow.graph_config)
 
-        # Convert string UUIDs to UUID objects
-        dependency_ids = []
-        for dep_id in dependencies:
-            try:
-                if isinstance(dep_id, str):
-                    dependency_ids.append(uuid.UUID(dep_id))
-                else:
-                    dependency_ids.append(dep_id)
-            except ValueError:
-                continue
+    def get_transitive_dependencies(
+        self,
+        session: Session,
+        workflow_id: uuid.UUID,
+    ) -> list[uuid.UUID]:
+        """
+        Get every workflow a workflow depends on, directly or indirectly.
+
+        Runs as a single recursive query instead of one query per workflow.
+
+        Args:
+            session: Database session
+            workflow_id: Workflow ID
 
-        return dependency_ids
+        Returns:
+            List of dependency workflow IDs, in no particular order
+        """
+        rows = session.execute(
+            _TRANSITIVE_DEPENDENCIES_SQL,
+            {"workflow_id": workflow_id, "uuid_pattern": _UUID_PATTERN},
+        )
+        return list(rows.scalars())
 
     def add_dependency(
         self,
@@ -98,11 +263,14 @@ class DependencyManager:
         dependencies = graph_config.get("dependencies", [])
 
         # Add dependency if not already present
+        # Assign a new dict; an in-place change to the JSON column is not
+        # detected and would never be written
         dep_id_str = str(depends_on_workflow_id)
         if dep_id_str not in dependencies:
-            dependencies.append(dep_id_str)
-            graph_config["dependencies"] = dependencies
-            workflow.graph_config = graph_config
+            workflow.graph_config = {
+                **graph_config,
+                "dependencies": [*dependencies, dep_id_str],
+            }
 
             session.add(workflow)
             session.commit()
@@ -130,9 +298,10 @@ class DependencyManager:
 
         dep_id_str = str(depends_on_workflow_id)
         if dep_id_str in dependencies:
-            dependencies.remove(dep_id_str)
-            graph_config["dependencies"] = dependencies
-            workflow.graph_config = graph_config
+            workflow.graph_config = {
+                **graph_config,
+                "dependencies": [dep for dep in dependencies if dep != dep_id_str],
+            }
 
             session.add(workflow)
             session.commit()
@@ -153,16 +322,25 @@ class DependencyManager:
             Tuple of (is_valid, errors)
         """
         errors = []
+        graph = self._load_dependency_graph(session, workflow_id)
+
+        # Check for circular dependencies, reporting one cycle per
+        # strongly connected component
+        for component in _cyclic_components(graph):
+            members = set(component)
+            subgraph = {
+                node: [dep for dep in graph[node] if dep in members]
+                for node in component
+            }
+            cycle = _find_cycle(subgraph, component[0])
+            errors.append(
+                f"Circular dependency detected for workflow {workflow_id}: "
+                + " -> ".join(str(node) for node in cycle)
+            )
 
-        # Check for circular dependencies
-        if self._has_circular_dependency(session, workflow_id):
-            errors.append(f"Circular dependency detected for workflow {workflow_id}")
-
-        # Check if all dependencies exist
-        dependencies = self.get_workflow_dependencies(session, workflow_id)
-        for dep_id in dependencies:
-            dep_workflow = session.get(Workflow, dep_id)
-            if not dep_workflow:
+        # Check if all dependencies exist; missing workflows never load
+        for dep_id in graph.get(workflow_id, []):
+            if dep_id not in graph:
                 errors.append(f"Dependency {dep_id} not found")
 
         return (len(errors) == 0, errors)
@@ -232,61 +410,72 @@ class DependencyManager:
         Returns:
             True if circular dependency would be created
         """
-        # Check if depends_on_workflow_id depends on workflow_id (directly or indirectly)
-        visited: set[uuid.UUID] = set()
-
-        def check_depends_on(target: uuid.UUID, check_for: uuid.UUID) -> bool:
-            if target == check_for:
-                return True
-
-            if target in visited:
-                return False
-
-            visited.add(target)
-            dependencies = self.get_workflow_dependencies(session, target)
+        # The new edge closes a cycle iff workflow_id is reachable from
+        # depends_on_workflow_id. Search forward one level per query and stop
+        # as soon as it turns up, without loading the rest of the graph.
+        if depends_on_workflow_id == workflow_id:
+            return True
+
+        seen = {depends_on_workflow_id}
+        frontier = {depends_on_workflow_id}
+        while frontier:
+            level = self._load_dependencies(session, frontier)
+            frontier = set()
+            for dependencies in level.values():
+                for dep_id in dependencies:
+                    if dep_id == workflow_id:
+                        return True
+                    if dep_id not in seen:
+                        seen.add(dep_id)
+                        frontier.add(dep_id)
 
-            for dep_id in dependencies:
-                if check_depends_on(dep_id, check_for):
-                    return True
+        return False
 
-            return False
+    def _load_dependencies(
+        self,
+        session: Session,
+        workflow_ids: Iterable[uuid.UUID],
+    ) -> dict[uuid.UUID, list[uuid.UUID]]:
+        """
+        Load the dependencies of several workflows in one query.
 
-        return check_depends_on(depends_on_workflow_id, workflow_id)
+        Workflows that do not exist are left out of the result.
+        """
+        rows = session.exec(
+            select(Workflow.id, Workflow.graph_config).where(
+                Workflow.id.in_(list(workflow_ids))
+            )
+        )
+        return {row.id: _parse_dependency_ids(row.graph_config) for row in rows}
 
-    def _has_circular_dependency(
+    def _load_dependency_graph(
         self,
         session: Session,
         workflow_id: uuid.UUID,
-    ) -> bool:
+    ) -> dict[uuid.UUID, list[uuid.UUID]]:
         """
-        Check if workflow has circular dependencies.
+        Load every workflow reachable from a workflow through its dependencies.
 
-        Args:
-            session: Database session
-            workflow_id: Workflow ID
+        Loads one level of the graph per query instead of one workflow per
+        query.
 
         Returns:
-            True if circular dependency exists
+            Adjacency lists keyed by workflow ID
         """
-        visited: set[uuid.UUID] = set()
-        rec_stack: set[uuid.UUID] = set()
-
-        def has_cycle(node: uuid.UUID) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
-
-            dependencies = self.get_workflow_dependencies(session, node)
-            for dep_id in dependencies:
-                if dep_id not in visited:
-                    if has_cycle(dep_id):
-                        return True
-                elif dep_id in rec_stack:
-                    return True
-
-            rec_stack.remove(node)
-            return False
-
-        return has_cycle(workflow_id)
+        graph: dict[uuid.UUID, list[uuid.UUID]] = {}
+        seen = {workflow_id}
+        frontier = {workflow_id}
+        while frontier:
+            level = self._load_dependencies(session, frontier)
+            graph.update(level)
+            frontier = {
+                dep_id
+                for dependencies in level.values()
+                for dep_id in dependencies
+                if dep_id not in seen
+            }
+            seen |= frontier
+        return graph
 
 
 # Default dependency manager instance
@@ -5,6 +5,7 @@ Provides complete audit trail and replay capability for workflow executions.
 """
 
 import uuid
+from collections.abc import Iterator
 from typing import Any
 
 from sqlmodel import Session, select
@@ -12,6 +13,9 @@ from sqlmodel import Session, select
 from app.models import ExecutionLog, WorkflowExecution
 from app.workflows.engine import WorkflowEngine
 
+# Rows fetched per server-side cursor batch when streaming logs
+LOG_STREAM_YIELD_PER = 100
+
 
 class HistoryError(Exception):
     """Base exception for history errors."""
@@ -59,9 +63,53 @@ class ExecutionHistory:
         Returns:
             List of execution logs
         """
-        query = select(ExecutionLog).where(
-            ExecutionLog.execution_id == execution_id,
+        query = self._filter_execution_logs(
+            select(ExecutionLog), execution_id, node_id, level, limit
         )
+        logs = session.exec(query).all()
+        return list(logs)
+
+    def iter_execution_logs(
+        self,
+        session: Session,
+        execution_id: uuid.UUID,
+        node_id: str | None = None,
+        level: str | None = None,
+        limit: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream execution logs as plain dicts, with the same filtering as
+        get_execution_logs.
+
+        Rows are read through a server-side cursor in batches of
+        LOG_STREAM_YIELD_PER, so memory stays bounded however many logs match.
+        """
+        query = self._filter_execution_logs(
+            select(
+                ExecutionLog.id,
+                ExecutionLog.node_id,
+                ExecutionLog.level,
+                ExecutionLog.message,
+                ExecutionLog.timestamp,
+            ),
+            execution_id,
+            node_id,
+            level,
+            limit,
+        )
+        rows = session.exec(query.execution_options(yield_per=LOG_STREAM_YIELD_PER))
+        for row in rows:
+            yield row._asdict()
+
+    @staticmethod
+    def _filter_execution_logs(
+        query: Any,
+        execution_id: uuid.UUID,
+        node_id: str | None,
+        level: str | None,
+        limit: int,
+    ) -> Any:
+        query = query.where(ExecutionLog.execution_id == execution_id)
 
         if node_id:
             query = query.where(ExecutionLog.node_id == node_id)
@@ -69,10 +117,7 @@ class ExecutionHistory:
         if level:
             query = query.where(ExecutionLog.level == level)
 
-        query = query.order_by(ExecutionLog.timestamp).limit(limit)
-
-        logs = session.exec(query).all()
-        return list(logs)
+        return query.order_by(ExecutionLog.timestamp).limit(limit)
 
     def get_execution_timeline(
         self,
@@ -0,0 +1,71 @@
+"""
+Workflow List Cache
+
+Caches the serialized workflow list for each (owner, skip, limit) page, so the
+dashboard and workflow picker reloading the same page skip the query and the
+response serialization.
+
+Pages are keyed under a per-owner generation counter; any write to one of an
+owner's workflows bumps the counter, orphaning every cached page at once
+without having to enumerate the keys (which the in-memory fallback cannot do).
+With Redis, pages are kept there only, since an orphaned page body in process
+memory would never be read again; without it, the memory tier's size bound
+and expiry sweep reclaim them.
+"""
+
+import uuid
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.cache import default_cache_service
+from app.models import Workflow, WorkflowPublic
+
+WORKFLOW_LIST_CACHE_TTL_SECONDS = 60
+# Counters outlive any page cached under them, so one expiring and restarting
+# from zero can never bring back a stale page
+WORKFLOW_LIST_GENERATION_TTL_SECONDS = 24 * 60 * 60
+
+_WORKFLOW_LIST_ADAPTER = TypeAdapter(list[WorkflowPublic])
+
+
+def _generation_key(owner_id: uuid.UUID) -> str:
+    return f"workflows:{owner_id}:generation"
+
+
+def _page_key(owner_id: uuid.UUID, skip: int, limit: int) -> str:
+    generation = default_cache_service.get(_generation_key(owner_id)) or 0
+    return f"workflows:{owner_id}:{generation}:{skip}:{limit}"
+
+
+def get_cached_workflow_list(owner_id: uuid.UUID, skip: int, limit: int) -> str | None:
+    """Get the cached JSON body of a workflow list page, or None if not cached."""
+    return default_cache_service.get(_page_key(owner_id, skip, limit))
+
+
+def cache_workflow_list(
+    owner_id: uuid.UUID, skip: int, limit: int, workflows: list[Workflow]
+) -> str:
+    """Serialize a workflow list page, cache it and return the JSON body."""
+    # Serialized through WorkflowPublic exactly as response_model=WorkflowPublic
+    # would, so cached pages are byte-identical to uncached responses
+    body = orjson.dumps(
+        _WORKFLOW_LIST_ADAPTER.dump_python(
+            _WORKFLOW_LIST_ADAPTER.validate_python(workflows, from_attributes=True),
+            mode="json",
+        )
+    ).decode()
+    default_cache_service.set(
+        _page_key(owner_id, skip, limit),
+        body,
+        ttl_seconds=WORKFLOW_LIST_CACHE_TTL_SECONDS,
+        local_copy=False,
+    )
+    return body
+
+
+def invalidate_workflow_list_cache(owner_id: uuid.UUID) -> None:
+    """Drop every cached workflow list page of an owner after a write."""
+    default_cache_service.incr(
+        _generation_key(owner_id), ttl_seconds=WORKFLOW_LIST_GENERATION_TTL_SECONDS
+    )
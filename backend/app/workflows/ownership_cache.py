@@ -0,0 +1,36 @@
+"""
+Execution Ownership Cache
+
+Caches which user owns each workflow execution, so execution-scoped routes
+(status polling, logs, debugger stepping) can authorize without querying the
+execution and its workflow on every call.
+
+An execution's workflow, and a workflow's owner, never change, so entries only
+expire. An entry outliving a deleted execution only lets its former owner reach
+a handler that then finds nothing.
+"""
+
+import uuid
+
+from app.cache import default_cache_service
+
+EXECUTION_OWNER_CACHE_TTL_SECONDS = 300
+
+
+def _execution_owner_key(execution_id: uuid.UUID) -> str:
+    return f"execution_owner:{execution_id}"
+
+
+def get_execution_owner_id(execution_id: uuid.UUID) -> uuid.UUID | None:
+    """Get the cached owner of an execution, or None if not cached."""
+    owner_id = default_cache_service.get(_execution_owner_key(execution_id))
+    return uuid.UUID(owner_id) if owner_id else None
+
+
+def set_execution_owner_id(execution_id: uuid.UUID, owner_id: uuid.UUID) -> None:
+    """Cache the owner of an execution."""
+    default_cache_service.set(
+        _execution_owner_key(execution_id),
+        str(owner_id),
+        ttl_seconds=EXECUTION_OWNER_CACHE_TTL_SECONDS,
+    )
@@ -14,6 +14,7 @@ import uuid
 from datetime import datetime
 from typing import Any
 
+from sqlalchemy.orm import joinedload
 from sqlmodel import Session, select
 
 from app.models import WorkflowWebhookSubscription
@@ -92,9 +93,15 @@ class WebhookTriggerManager:
         Returns:
             WorkflowWebhookSubscription if found, None otherwise
         """
-        query = select(WorkflowWebhookSubscription).where(
-            WorkflowWebhookSubscription.webhook_path == webhook_path,
-            WorkflowWebhookSubscription.is_active.is_(True),
+        # The workflow is joined in so that triggering an execution finds it in
+        # the session instead of loading it in a second round-trip
+        query = (
+            select(WorkflowWebhookSubscription)
+            .options(joinedload(WorkflowWebhookSubscription.workflow))
+            .where(
+                WorkflowWebhookSubscription.webhook_path == webhook_path,
+                WorkflowWebhookSubscription.is_active.is_(True),
+            )
         )
 
         return session.exec(query).first()
@@ -209,12 +216,12 @@ class WebhookTriggerManager:
             payload, headers, subscription.filters
         )
 
-        # Create workflow execution
+        # Create workflow execution; webhooks may be intentionally duplicate,
+        # and create_execution never deduplicates
         execution = self.workflow_engine.create_execution(
             session,
             subscription.workflow_id,
             trigger_data=trigger_data,
-            idempotent=False,  # Webhooks may be intentionally duplicate
         )
 
         return execution.id
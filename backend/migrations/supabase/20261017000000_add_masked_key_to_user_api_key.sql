@@ -0,0 +1,13 @@
+-- Migration: add_masked_key_to_user_api_key
+-- Revision ID: 20261017000000
+-- Revises: 20250104000000
+-- Create Date: 2026-10-17 00:00:00.000000
+
+-- Store the display mask alongside the key reference so listing keys
+-- no longer needs one Infisical round-trip per row
+ALTER TABLE user_api_key ADD COLUMN IF NOT EXISTS masked_key VARCHAR(50);
+
+-- Existing rows are backfilled by backend/scripts/backfill_api_key_masks.py
+
+-- Update Alembic version tracking
+-- Note: This will be done separately after verifying the migration succeeded
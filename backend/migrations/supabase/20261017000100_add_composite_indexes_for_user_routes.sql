@@ -0,0 +1,31 @@
+-- Migration: add_composite_indexes_for_user_routes
+-- Revision ID: 20261017000100
+-- Revises: 20261017000000
+-- Create Date: 2026-10-17 00:01:00.000000
+
+-- CONCURRENTLY avoids blocking writes while the indexes build; run outside a transaction.
+-- The unique builds fail on duplicate rows left by concurrent check-then-insert
+-- requests, so check first; both queries must return no rows:
+--   SELECT team_id, user_id, count(*) FROM teammember
+--     GROUP BY team_id, user_id HAVING count(*) > 1;
+--   SELECT user_id, service_name, credential_type, count(*) FROM user_api_key
+--     GROUP BY user_id, service_name, credential_type HAVING count(*) > 1;
+-- If a build fails anyway, DROP INDEX CONCURRENTLY the INVALID index left behind
+-- before rerunning, since IF NOT EXISTS would skip it.
+
+-- Team membership/permission checks filter on (team_id, user_id)
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_teammember_team_user
+    ON teammember(team_id, user_id);
+
+-- API key lookups filter on (user_id, service_name, credential_type)
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_userapikey_user_svc_cred
+    ON user_api_key(user_id, service_name, credential_type);
+
+-- Active-session queries filter on (user_id, expires_at)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_usersession_user_expires
+    ON user_session(user_id, expires_at);
+
+-- user_preferences.user_id is already covered by its unique index
+
+-- Update Alembic version tracking
+-- Note: This will be done separately after verifying the migration succeeded
@@ -0,0 +1,13 @@
+-- Migration: add_recent_login_partial_index
+-- Revision ID: 20261017000200
+-- Revises: 20261017000100
+-- Create Date: 2026-10-17 00:02:00.000000
+
+-- Recent successful-login checks filter on (user_id, success = TRUE, created_at > ?)
+-- CONCURRENTLY avoids blocking logins while the index builds; run outside a transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_login_history_user_recent
+    ON login_history(user_id, created_at DESC)
+    WHERE success = TRUE;
+
+-- Update Alembic version tracking
+-- Note: This will be done separately after verifying the migration succeeded
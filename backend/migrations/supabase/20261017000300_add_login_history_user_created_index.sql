@@ -0,0 +1,12 @@
+-- Migration: add_login_history_user_created_index
+-- Revision ID: 20261017000300
+-- Revises: 20261017000200
+-- Create Date: 2026-10-17 00:03:00.000000
+
+-- Login history listing filters on user_id and orders by created_at DESC
+-- CONCURRENTLY avoids blocking logins while the index builds; run outside a transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_login_history_user_created
+    ON login_history(user_id, created_at DESC);
+
+-- Update Alembic version tracking
+-- Note: This will be done separately after verifying the migration succeeded
@@ -0,0 +1,12 @@
+-- Migration: drop_redundant_user_api_key_user_index
+-- Revision ID: 20261017000400
+-- Revises: 20261017000300
+-- Create Date: 2026-10-17 00:04:00.000000
+
+-- user_id lookups (list and create) are served by the leading column of
+-- ix_userapikey_user_svc_cred (user_id, service_name, credential_type), so the
+-- single-column index only adds write cost. Run outside a transaction.
+DROP INDEX CONCURRENTLY IF EXISTS ix_user_api_key_user_id;
+
+-- Update Alembic version tracking
+-- Note: This will be done separately after verifying the migration succeeded
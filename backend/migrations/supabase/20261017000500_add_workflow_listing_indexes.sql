@@ -0,0 +1,21 @@
+-- Migration: add_workflow_listing_indexes
+-- Revision ID: 20261017000500
+-- Revises: 20261017000400
+-- Create Date: 2026-10-17 00:05:00.000000
+
+-- Workflow listings filter on owner_id (also used by the execution listing join)
+-- CONCURRENTLY avoids blocking writes while the indexes build; run outside a transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_workflow_owner_id
+    ON workflow(owner_id);
+
+-- Per-workflow execution listing filters on workflow_id and orders by started_at DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_workflowexecution_workflow_started
+    ON workflowexecution(workflow_id, started_at DESC);
+
+-- Failed-execution listing only ever reads failed rows, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_workflowexecution_failed_started
+    ON workflowexecution(started_at DESC)
+    WHERE status = 'failed';
+
+-- Update Alembic version tracking
+-- Note: This will be done separately after verifying the migration succeeded
@@ -0,0 +1,18 @@
+-- Migration: cover_workflow_execution_stats_index
+-- Revision ID: 20261017000600
+-- Revises: 20261017000500
+-- Create Date: 2026-10-17 00:06:00.000000
+
+-- Analytics windows filter executions on workflow_id and a started_at range,
+-- then count by status and average completed_at - started_at. Including those
+-- columns turns the range scan into an index-only scan; the key is the same
+-- as ix_workflowexecution_workflow_started, which it replaces for listings
+-- CONCURRENTLY avoids blocking writes while the index builds; run outside a transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_workflowexecution_workflow_started_stats
+    ON workflowexecution(workflow_id, started_at DESC)
+    INCLUDE (status, completed_at);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_workflowexecution_workflow_started;
+
+-- Update Alembic version tracking
+-- Note: This will be done separately after verifying the migration succeeded
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Script to backfill the masked_key column on existing user API keys.
+
+Keys created before masked_key existed only have their value in Infisical.
+This reads each such key from Infisical once and stores its display mask,
+so listing API keys no longer needs a secrets-manager round-trip per row.
+
+Rows are processed in chunks: Infisical lookups for a chunk run on a small
+thread pool and the masks are written back with one bulk UPDATE per chunk.
+
+Usage:
+    cd backend && source .venv/bin/activate
+    python scripts/backfill_api_key_masks.py
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add backend directory to path so we can import app modules
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# Load environment variables from .env file
+from dotenv import load_dotenv
+
+env_path = backend_dir / ".env"
+if env_path.exists():
+    load_dotenv(env_path)
+
+from sqlmodel import Session, select, update
+
+from app.core.db import engine
+from app.models import UserAPIKey
+from app.services.api_keys import default_api_key_service
+
+CHUNK_SIZE = 1000
+MAX_WORKERS = 8
+
+
+def _masked_key_for(row) -> str | None:
+    """Read one key from Infisical and return its mask, or None if missing."""
+    credentials = default_api_key_service.retrieve_api_key(
+        str(row.user_id), row.service_name, row.credential_type
+    )
+    main_key = credentials.get("api_key", "") if credentials else ""
+    return default_api_key_service.mask_key(main_key) if main_key else None
+
+
+def backfill_api_key_masks() -> None:
+    """Store masked_key for every API key row that is missing it."""
+    updated = 0
+    missing = 0
+    last_id = None
+
+    with Session(engine) as session, ThreadPoolExecutor(MAX_WORKERS) as executor:
+        while True:
+            statement = (
+                select(
+                    UserAPIKey.id,
+                    UserAPIKey.user_id,
+                    UserAPIKey.service_name,
+                    UserAPIKey.credential_type,
+                )
+                .where(UserAPIKey.masked_key.is_(None))
+                .order_by(UserAPIKey.id)
+                .limit(CHUNK_SIZE)
+            )
+            if last_id is not None:
+                statement = statement.where(UserAPIKey.id > last_id)
+            rows = session.exec(statement).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            masks = executor.map(_masked_key_for, rows)
+            params = [
+                {"id": row.id, "masked_key": masked_key}
+                for row, masked_key in zip(rows, masks, strict=True)
+                if masked_key is not None
+            ]
+            missing += len(rows) - len(params)
+
+            if params:
+                # Bulk UPDATE by primary key, executed as a single executemany
+                session.execute(update(UserAPIKey), params)
+                session.commit()
+                updated += len(params)
+
+    if not updated and not missing:
+        print("✅ All API keys already have a masked_key")
+        return
+
+    print(f"✅ Backfilled masked_key for {updated} API key(s)")
+    if missing:
+        print(f"⚠️  {missing} API key(s) could not be read from Infisical")
+
+
+if __name__ == "__main__":
+    backfill_api_key_masks()
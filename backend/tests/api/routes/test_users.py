@@ -2,12 +2,15 @@ import uuid
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session, select
+from sqlalchemy import event
+from sqlmodel import Session, delete, select
 
 from app import crud
+from app.api.routes.users import API_KEY_TEST_RATE_LIMIT
 from app.core.config import settings
+from app.core.db import engine
 from app.core.security import verify_password
-from app.models import User, UserCreate
+from app.models import User, UserAPIKey, UserCreate
 from tests.utils.utils import random_email, random_lower_string
 
 
@@ -168,6 +171,35 @@ def test_retrieve_users(
         assert "email" in item
 
 
+def test_retrieve_users_keyset_pagination(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        user_in = UserCreate(email=random_email(), password=random_lower_string())
+        crud.create_user(session=db, user_create=user_in)
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 2},
+    )
+    first_page = r.json()
+    assert len(first_page["data"]) == 2
+    assert first_page["next_cursor"] == first_page["data"][-1]["id"]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "after_id": first_page["next_cursor"]},
+    )
+    second_page = r.json()
+    assert second_page["data"]
+    first_ids = {item["id"] for item in first_page["data"]}
+    for item in second_page["data"]:
+        assert item["id"] not in first_ids
+        assert uuid.UUID(item["id"]) > uuid.UUID(first_page["next_cursor"])
+
+
 def test_update_user_me(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -484,3 +516,99 @@ def test_delete_user_without_privileges(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "The user doesn't have enough privileges"
+
+
+def test_list_available_services_etag(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/users/me/api-keys/services")
+    assert r.status_code == 200
+    assert "openai" in r.json()["services"]
+    etag = r.headers["etag"]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me/api-keys/services",
+        headers={"If-None-Match": etag},
+    )
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+
+
+def test_list_user_api_keys_single_query(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    for service_name in ("openai", "anthropic", "cohere"):
+        db.add(
+            UserAPIKey(
+                user_id=user.id,
+                service_name=service_name,
+                service_display_name=service_name,
+                credential_type="api_key",
+                infisical_path=f"/users/{user.id}/api-keys/{service_name}/api_key",
+                key_hash=random_lower_string(),
+                masked_key="sk-a...1234",
+            )
+        )
+    db.commit()
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+        if "user_api_key" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        r = client.get(
+            f"{settings.API_V1_STR}/users/me/api-keys",
+            headers=normal_user_token_headers,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        db.execute(delete(UserAPIKey).where(UserAPIKey.user_id == user.id))
+        db.commit()
+
+    assert r.status_code == 200
+    assert len(r.json()) == 3
+    # Listing must not grow per-row queries (lazy loads, secret lookups, ...)
+    assert len(statements) == 1
+
+
+def test_test_user_api_key_rate_limited(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    # Twitter keys validate without a provider call once the stored key is
+    # found, so only the Infisical lookup needs stubbing
+    api_key = UserAPIKey(
+        user_id=user.id,
+        service_name="twitter",
+        service_display_name="Twitter/X",
+        credential_type="api_key",
+        infisical_path=f"/users/{user.id}/api-keys/twitter/api_key",
+        key_hash=random_lower_string(),
+        masked_key="tw-a...1234",
+    )
+    db.add(api_key)
+    db.commit()
+
+    try:
+        with patch(
+            "app.api.routes.users.default_api_key_service.retrieve_api_key",
+            return_value={"api_key": random_lower_string()},
+        ):
+            responses = [
+                client.post(
+                    f"{settings.API_V1_STR}/users/me/api-keys/{api_key.id}/test",
+                    headers=normal_user_token_headers,
+                )
+                for _ in range(API_KEY_TEST_RATE_LIMIT + 1)
+            ]
+    finally:
+        db.execute(delete(UserAPIKey).where(UserAPIKey.id == api_key.id))
+        db.commit()
+
+    assert all(r.status_code == 200 for r in responses[:-1])
+    assert responses[-1].status_code == 429
+    assert "retry-after" in responses[-1].headers
@@ -0,0 +1,134 @@
+"""
+Unit tests for API Key Service
+
+Tests API key service functionality including:
+- Key masking and hashing
+- Credential caching and invalidation
+"""
+
+import hashlib
+import json
+
+import pytest
+
+from app.services import api_keys
+from app.services.api_keys import APIKeyService
+
+
+class FakeSecretsService:
+    """In-memory stand-in for the Infisical-backed secrets service."""
+
+    def __init__(self):
+        self.secrets: dict[str, str] = {}
+        self.get_calls = 0
+
+    def store_secret(self, secret_key, secret_value, environment="dev", path="/"):
+        self.secrets[f"{path}:{secret_key}"] = secret_value
+
+    def get_secret(
+        self, secret_key, environment="dev", path="/", use_cache=True, **kwargs
+    ):
+        self.get_calls += 1
+        return self.secrets.get(f"{path}:{secret_key}", "")
+
+    def delete_secret(self, secret_key, environment="dev", path="/"):
+        self.secrets.pop(f"{path}:{secret_key}", None)
+
+
+@pytest.fixture
+def secrets_service():
+    """Create a fake secrets service for testing."""
+    return FakeSecretsService()
+
+
+@pytest.fixture
+def api_key_service(secrets_service):
+    """Create an APIKeyService backed by the fake secrets service."""
+    return APIKeyService(secrets_service=secrets_service)
+
+
+def test_mask_key(api_key_service):
+    """Test that only the edges of a key are shown."""
+    assert api_key_service.mask_key("sk-abcdefgh1234") == "sk-a...1234"
+    assert api_key_service.mask_key("abc") == "***"
+
+
+def test_hash_key(api_key_service):
+    """Test that keys are hashed with plain SHA-256."""
+    assert (
+        api_key_service.hash_key("sk-abcdefgh1234")
+        == hashlib.sha256(b"sk-abcdefgh1234").hexdigest()
+    )
+
+
+def test_retrieve_api_key_is_cached(api_key_service, secrets_service):
+    """Test that repeated retrievals hit the secrets service once."""
+    secrets_service.store_secret(
+        "user_user-1_openai_api_key",
+        json.dumps({"api_key": "sk-first"}),
+        path=api_key_service.get_infisical_path("user-1", "openai", "api_key"),
+    )
+
+    first = api_key_service.retrieve_api_key("user-1", "openai", "api_key")
+    second = api_key_service.retrieve_api_key("user-1", "openai", "api_key")
+
+    assert first == second == {"api_key": "sk-first"}
+    assert secrets_service.get_calls == 1
+
+
+def test_retrieve_api_keys_bulk(api_key_service, secrets_service):
+    """Test that bulk retrieval returns every requested key, None if missing."""
+    api_key_service.store_api_key("user-1", "openai", "sk-openai", "api_key")
+    api_key_service.store_api_key("user-1", "anthropic", "sk-anthropic", "api_key")
+
+    credentials = api_key_service.retrieve_api_keys_bulk(
+        "user-1",
+        [("openai", "api_key"), ("anthropic", "api_key"), ("cohere", "api_key")],
+    )
+
+    assert credentials == {
+        ("openai", "api_key"): {"api_key": "sk-openai"},
+        ("anthropic", "api_key"): {"api_key": "sk-anthropic"},
+        ("cohere", "api_key"): None,
+    }
+    # Only the key that was never stored needed a round-trip
+    assert secrets_service.get_calls == 1
+
+
+def test_store_api_key_updates_cache(api_key_service, secrets_service):
+    """Test that a stored key is read back without hitting the secrets service."""
+    api_key_service.store_api_key("user-1", "openai", "sk-first", "api_key")
+    api_key_service.retrieve_api_key("user-1", "openai", "api_key")
+
+    api_key_service.store_api_key("user-1", "openai", "sk-second", "api_key")
+
+    credentials = api_key_service.retrieve_api_key("user-1", "openai", "api_key")
+    assert credentials == {"api_key": "sk-second"}
+    assert secrets_service.get_calls == 0
+
+
+def test_delete_api_key_invalidates_cache(api_key_service):
+    """Test that a deleted key is not served from the cache."""
+    api_key_service.store_api_key("user-1", "openai", "sk-first", "api_key")
+    api_key_service.retrieve_api_key("user-1", "openai", "api_key")
+
+    api_key_service.delete_api_key("user-1", "openai", "api_key")
+
+    assert api_key_service.retrieve_api_key("user-1", "openai", "api_key") is None
+
+
+def test_cached_credentials_expire(api_key_service, secrets_service, monkeypatch):
+    """Test that cached credentials are refetched after the TTL."""
+    secrets_service.store_secret(
+        "user_user-1_openai_api_key",
+        json.dumps({"api_key": "sk-first"}),
+        path=api_key_service.get_infisical_path("user-1", "openai", "api_key"),
+    )
+    now = 1000.0
+    monkeypatch.setattr(api_keys.time, "monotonic", lambda: now)
+    api_key_service.retrieve_api_key("user-1", "openai", "api_key")
+
+    now += api_keys.CREDENTIALS_CACHE_TTL_SECONDS
+    api_key_service.retrieve_api_key("user-1", "openai", "api_key")
+
+    assert secrets_service.get_calls == 2
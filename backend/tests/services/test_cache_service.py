@@ -0,0 +1,63 @@
+"""
+Unit tests for the Cache Service
+
+Tests the bounds on the in-memory tier:
+- Least recently used eviction past the size limit
+- Periodic sweep of expired entries
+"""
+
+import time
+
+import pytest
+
+from app.cache import service
+from app.cache.service import CacheService
+
+
+@pytest.fixture
+def cache_service(monkeypatch):
+    """Create a memory-only CacheService instance for testing."""
+    monkeypatch.setattr(CacheService, "_check_redis_availability", lambda self: None)
+    return CacheService()
+
+
+def test_memory_tier_evicts_least_recently_used(cache_service, monkeypatch):
+    """Test that the oldest unread entry is evicted past the size limit."""
+    monkeypatch.setattr(service, "MEMORY_CACHE_MAX_ENTRIES", 2)
+
+    cache_service.set("a", 1)
+    cache_service.set("b", 2)
+    assert cache_service.get("a") == 1
+    cache_service.set("c", 3)
+
+    assert cache_service.get("b") is None
+    assert cache_service.get("a") == 1
+    assert cache_service.get("c") == 3
+
+
+def test_memory_tier_sweeps_expired_entries(cache_service, monkeypatch):
+    """Test that expired entries are dropped even if never read again."""
+    cache_service.set("orphan", "value", ttl_seconds=1)
+    cache_service.set("kept", "value")
+
+    now = time.time() + service.MEMORY_CACHE_SWEEP_INTERVAL_SECONDS + 1
+    monkeypatch.setattr(service.time, "time", lambda: now)
+    cache_service.set("trigger", "value")
+
+    assert set(cache_service._memory_cache) == {"kept", "trigger"}
+
+
+def test_local_copy_skipped_only_with_redis(cache_service):
+    """Test that local_copy=False keeps values out of memory only when Redis is up."""
+    cache_service.set("memory-only", "value", local_copy=False)
+    assert cache_service.get("memory-only") == "value"
+
+    stored = {}
+    cache_service._redis_available = True
+    cache_service._redis_client = type(
+        "FakeRedis", (), {"set": lambda self, key, value: stored.update({key: value})}
+    )()
+    cache_service.set("remote-only", "value", local_copy=False)
+
+    assert "remote-only" not in cache_service._memory_cache
+    assert stored == {"remote-only": '"value"'}
@@ -0,0 +1,146 @@
+"""
+Unit tests for Workflow Dependencies
+
+Tests dependency graph functionality including:
+- Dependency graph validation
+- Circular dependency detection
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from app.models import User, Workflow
+from app.workflows.dependencies import DependencyError, DependencyManager
+
+
+@pytest.fixture
+def db_session():
+    """Create an in-memory database session for testing."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine, tables=[User.__table__, Workflow.__table__])
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def owner(db_session):
+    """Create the user owning the test workflows."""
+    user = User(email="owner@example.com", hashed_password="not-a-real-hash")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def make_workflows(db_session, owner):
+    """Create workflows wired up as in an edge list of (workflow, depends_on)."""
+
+    def make(names: str, edges: list[tuple[str, str]]) -> dict[str, uuid.UUID]:
+        ids = {name: uuid.uuid4() for name in names}
+        now = datetime.now(timezone.utc)
+        for name, workflow_id in ids.items():
+            dependencies = [str(ids[dep]) for src, dep in edges if src == name]
+            db_session.add(
+                Workflow(
+                    id=workflow_id,
+                    name=name,
+                    owner_id=owner.id,
+                    graph_config={"dependencies": dependencies},
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        db_session.commit()
+        return ids
+
+    return make
+
+
+@pytest.fixture
+def manager():
+    """Create a DependencyManager instance for testing."""
+    return DependencyManager()
+
+
+def test_validate_acyclic_graph(db_session, make_workflows, manager):
+    """Test that a diamond-shaped graph is valid."""
+    ids = make_workflows("abcd", [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")])
+
+    assert manager.validate_dependency_graph(db_session, ids["a"]) == (True, [])
+
+
+def test_validate_reports_cycle_path(db_session, make_workflows, manager):
+    """Test that a cycle is reported with the path that closes it."""
+    ids = make_workflows("abc", [("a", "b"), ("b", "c"), ("c", "b")])
+
+    is_valid, errors = manager.validate_dependency_graph(db_session, ids["a"])
+
+    assert not is_valid
+    assert errors == [
+        f"Circular dependency detected for workflow {ids['a']}: "
+        f"{ids['b']} -> {ids['c']} -> {ids['b']}"
+    ]
+
+
+def test_validate_reports_missing_dependency(db_session, make_workflows, manager):
+    """Test that a dependency on a nonexistent workflow is reported."""
+    ids = make_workflows("a", [])
+    missing_id = uuid.uuid4()
+    workflow = db_session.get(Workflow, ids["a"])
+    workflow.graph_config = {"dependencies": [str(missing_id)]}
+    db_session.add(workflow)
+    db_session.commit()
+
+    is_valid, errors = manager.validate_dependency_graph(db_session, ids["a"])
+
+    assert not is_valid
+    assert errors == [f"Dependency {missing_id} not found"]
+
+
+def test_validate_reports_every_cycle(db_session, make_workflows, manager):
+    """Test that each independent cycle, including a self-loop, is reported."""
+    ids = make_workflows(
+        "abcde",
+        [("a", "b"), ("a", "d"), ("b", "c"), ("c", "b"), ("d", "e"), ("e", "e")],
+    )
+
+    is_valid, errors = manager.validate_dependency_graph(db_session, ids["a"])
+
+    assert not is_valid
+    prefix = f"Circular dependency detected for workflow {ids['a']}: "
+    assert sorted(errors) == sorted(
+        [
+            prefix + f"{ids['b']} -> {ids['c']} -> {ids['b']}",
+            prefix + f"{ids['e']} -> {ids['e']}",
+        ]
+    )
+
+
+def test_add_dependency(db_session, make_workflows, manager):
+    """Test that a dependency that keeps the graph acyclic is stored."""
+    ids = make_workflows("abc", [("a", "b"), ("b", "c")])
+
+    manager.add_dependency(db_session, ids["a"], ids["c"])
+
+    assert manager.get_workflow_dependencies(db_session, ids["a"]) == [
+        ids["b"],
+        ids["c"],
+    ]
+
+
+def test_add_dependency_rejects_cycle(db_session, make_workflows, manager):
+    """Test that a dependency closing a cycle, however long, is rejected."""
+    ids = make_workflows("abc", [("a", "b"), ("b", "c")])
+
+    with pytest.raises(DependencyError, match="Circular dependency"):
+        manager.add_dependency(db_session, ids["c"], ids["a"])
+    with pytest.raises(DependencyError, match="Circular dependency"):
+        manager.add_dependency(db_session, ids["a"], ids["a"])
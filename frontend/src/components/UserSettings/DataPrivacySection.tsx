@@ -16,6 +16,9 @@ import useCustomToast from "@/hooks/useCustomToast"
 import { apiClient } from "@/lib/apiClient"
 import type { UserPreferences } from "@/types/api"
 
+const EXPORT_POLL_INTERVAL_MS = 2000
+const EXPORT_POLL_MAX_ATTEMPTS = 150
+
 export function DataPrivacySection() {
   const { showSuccessToast, showErrorToast } = useCustomToast()
   const queryClient = useQueryClient()
@@ -40,13 +43,33 @@ export function DataPrivacySection() {
 
   const exportDataMutation = useMutation({
     mutationFn: async () => {
-      return await apiClient.request<{
-        download_url: string
-        expires_at: string
-        message: string
+      // The export is built in the background; poll its status until done
+      const job = await apiClient.request<{
+        job_id: string
+        status: string
+        status_url: string
       }>("/api/v1/users/me/data/export", {
         method: "POST",
       })
+
+      for (let attempt = 0; attempt < EXPORT_POLL_MAX_ATTEMPTS; attempt++) {
+        await new Promise((resolve) =>
+          setTimeout(resolve, EXPORT_POLL_INTERVAL_MS),
+        )
+        const status = await apiClient.request<{
+          status: string
+          download_url: string | null
+          expires_at: string | null
+          error: string | null
+        }>(job.status_url)
+        if (status.status === "completed") {
+          return status
+        }
+        if (status.status === "failed") {
+          throw new Error(status.error || "Data export failed")
+        }
+      }
+      throw new Error("Data export is taking longer than expected")
     },
     onSuccess: (data) => {
       showSuccessToast(